@@ -0,0 +1,105 @@
+from typing import List
+import numpy as np
+
+class BatchNetwork:
+    """Feed forward for a whole population of genomes in one call.
+
+    Every genome's CompiledNetwork is laid out in one flat value array.
+    Nodes are engaged layer by layer across all genomes at once. The
+    connections leaving a layer are split into rounds in which each
+    destination appears at most once, so a round is a single vectorized
+    add and sums are still accumulated in the same order as Node.engage.
+    """
+    def __init__(self, genomes: List['Genome']):
+        compiled = [g.compiled if g.compiled is not None else g.compile() for g in genomes]
+        self.rows = len(compiled)
+        n_inputs = genomes[0].inputs if genomes else 0
+        n_outputs = genomes[0].outputs if genomes else 0
+
+        offsets = np.zeros(self.rows + 1, dtype=np.int64)
+        for i, net in enumerate(compiled):
+            offsets[i + 1] = offsets[i] + len(net.node_order)
+        total = int(offsets[-1])
+
+        # Two extra slots: one that always reads 0 for missing outputs and
+        # one that swallows inputs whose node is not in the network
+        self.zero_slot = total
+        self.sink_slot = total + 1
+        self.size = total + 2
+
+        def to_global(slots, offset, missing):
+            return [slot + offset if slot != -1 else missing for slot in slots]
+
+        input_index = []
+        output_index = []
+        bias_index = []
+        layers = []
+        src = []
+        dst = []
+        weight = []
+        for net, offset in zip(compiled, offsets[:-1].tolist()):
+            input_index.append(to_global(net.input_slots, offset, self.sink_slot))
+            output_index.append(to_global(net.output_slots, offset, self.zero_slot))
+            if net.bias_slot != -1:
+                bias_index.append(net.bias_slot + offset)
+            layers.extend(net.node_layers)
+            src.extend(slot + offset for slot in net.conn_src)
+            dst.extend(slot + offset for slot in net.conn_dst)
+            weight.extend(net.conn_weight)
+
+        self.input_index = np.array(input_index, dtype=np.int64).reshape(self.rows, n_inputs)
+        self.output_index = np.array(output_index, dtype=np.int64).reshape(self.rows, n_outputs)
+        self.bias_index = np.array(bias_index, dtype=np.int64)
+        layers = np.array(layers + [-1, -1], dtype=np.int64)
+        src = np.array(src, dtype=np.int64)
+        dst = np.array(dst, dtype=np.int64)
+        weight = np.array(weight, dtype=np.float64)
+
+        # Group connections by the layer of their source. The sort is stable
+        # so each genome keeps its own connection order within a layer.
+        src_layer = layers[src]
+        order = np.argsort(src_layer, kind='stable')
+        src, dst, weight, src_layer = src[order], dst[order], weight[order], src_layer[order]
+
+        max_layer = int(layers.max()) if total else 0
+        self.steps = []  # (slots to engage, [(src, dst, weight) per round])
+        for layer in range(max_layer + 1):
+            active = None
+            if layer != 0:  # No sigmoid for inputs and bias
+                active = np.flatnonzero(layers == layer)
+            in_layer = src_layer == layer
+            self.steps.append((active, self._rounds(src[in_layer], dst[in_layer], weight[in_layer])))
+
+    @staticmethod
+    def _rounds(src: np.ndarray, dst: np.ndarray, weight: np.ndarray) -> list:
+        """Split connections so no round adds to the same destination twice"""
+        if len(dst) == 0:
+            return []
+        # Rank of each connection among the earlier ones with the same destination
+        by_dst = np.argsort(dst, kind='stable')
+        sorted_dst = dst[by_dst]
+        run_start = np.flatnonzero(np.r_[True, sorted_dst[1:] != sorted_dst[:-1]])
+        run_length = np.diff(np.r_[run_start, len(dst)])
+        rank = np.empty(len(dst), dtype=np.int64)
+        rank[by_dst] = np.arange(len(dst)) - np.repeat(run_start, run_length)
+
+        rounds = []
+        for r in range(int(rank.max()) + 1):
+            mask = rank == r
+            rounds.append((src[mask], dst[mask], weight[mask]))
+        return rounds
+
+    def feed_forward(self, inputs: np.ndarray) -> np.ndarray:
+        """Run every genome on its row of inputs, returns one row of outputs each"""
+        values = np.zeros(self.size)
+        values[self.input_index] = inputs
+        values[self.bias_index] = 1.0
+
+        for active, rounds in self.steps:
+            if active is not None:
+                x = np.clip(values[active], -60, 60)
+                values[active] = 1 / (1 + np.exp(-4.9 * x))
+            for src, dst, weight in rounds:
+                values[dst] += weight * values[src]
+
+        return values[self.output_index]
@@ -0,0 +1,271 @@
+"""Benchmarks for the NEAT core and the simulation loop.
+
+    python -m benchmark --output baseline.json
+    python -m benchmark --baseline baseline.json
+
+Every benchmark is built from a fixed seed, so runs on the same machine are
+comparable; baselines from another machine are not, so none ships with the
+repository and you record your own first. Each one reports ops/sec and the peak memory tracemalloc sees
+during one op. With --baseline the results are compared against an earlier
+--output file and the exit status is 1 if anything got slower than the
+tolerance allows.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from genome import Genome
+from player import Player
+from population import Population
+import jit_kernels
+from simulation import World, run_generation
+from species import Species
+
+ENGINES = ["python", "numpy", "numba"]
+GENOME_SIZES = [10, 100, 1000]
+POPULATION_SIZES = [500, 5000]
+SEED = 1234
+
+def synthetic_genome(genes: int, rng: random.Random, inputs: int = 7, outputs: int = 3) -> Genome:
+    """A valid layered genome with the given number of genes.
+
+    Node numbers follow the usual order (inputs, outputs, bias, hidden) and
+    a connection's innovation number depends only on its two nodes, so
+    genomes of the same size share innovations like relatives do.
+    """
+    hidden = genes // 10
+    hidden_layers = min(3, hidden)
+    layers = hidden_layers + 2
+    bias_node = inputs + outputs
+    node_numbers = list(range(bias_node + 1 + hidden))
+    node_layers = [0] * inputs + [layers - 1] * outputs + [0]
+    node_layers += [1 + i % hidden_layers for i in range(hidden)]
+
+    # Every forward connection gets its innovation number from its position here
+    candidates = [(a, b) for a in node_numbers for b in node_numbers
+                  if node_layers[a] < node_layers[b]]
+    picked = sorted(rng.sample(range(len(candidates)), min(genes, len(candidates))))
+    gene_from = [candidates[i][0] for i in picked]
+    gene_to = [candidates[i][1] for i in picked]
+    weights = [rng.uniform(-1, 1) for _ in picked]
+    enabled = [rng.random() > 0.05 for _ in picked]
+
+    genome = Genome.from_arrays(inputs, outputs, layers, len(node_numbers), bias_node,
+                                node_numbers, node_layers, gene_from, gene_to,
+                                picked, weights, enabled)
+    genome.generate_network()
+    return genome
+
+def relative(genome: Genome, rng: random.Random) -> Genome:
+    """A copy with perturbed weights and a tenth of the genes dropped"""
+    child = genome.clone()
+    child.genes = [gene for gene in child.genes if rng.random() > 0.1]
+    for gene in child.genes:
+        gene.weight = max(-1, min(1, gene.weight + rng.gauss(0, 0.3)))
+    child.connect_nodes()
+    child.clear_caches()
+    child.generate_network()
+    return child
+
+def synthetic_population(size: int, rng: random.Random) -> Population:
+    """Players descended from a handful of 20 gene ancestors"""
+    ancestors = [synthetic_genome(20, rng) for _ in range(10)]
+    population = Population(0)
+    for i in range(size):
+        population.pop.append(Player(relative(ancestors[i % len(ancestors)], rng)))
+    return population
+
+def genome_benchmarks(genes: int) -> List[Tuple[str, Callable[[], Callable]]]:
+    def feed_forward():
+        genome = synthetic_genome(genes, random.Random(SEED))
+        inputs = [0.5] * genome.inputs
+        return lambda: genome.feed_forward(inputs)
+
+    def compiled_feed_forward():
+        genome = synthetic_genome(genes, random.Random(SEED))
+        genome.compile()
+        inputs = [0.5] * genome.inputs
+        return lambda: genome.compiled_feed_forward(inputs)
+
+    def crossover():
+        rng = random.Random(SEED)
+        parent = synthetic_genome(genes, rng)
+        partner = relative(parent, rng)
+        return lambda: parent.crossover(partner)
+
+    def clone():
+        genome = synthetic_genome(genes, random.Random(SEED))
+        return genome.clone
+
+    def compatibility_distance():
+        rng = random.Random(SEED)
+        genome1 = synthetic_genome(genes, rng)
+        genome2 = relative(genome1, rng)
+        species = Species()
+
+        def op():
+            # Children are new genomes, so start without sorted genes
+            genome1.sorted_genes = genome2.sorted_genes = None
+            species.get_compatibility_distance(genome1, genome2)
+        return op
+
+    return [(f"{setup.__name__}[{genes} genes]", setup)
+            for setup in (feed_forward, compiled_feed_forward, crossover, clone,
+                          compatibility_distance)]
+
+def population_benchmarks(size: int) -> List[Tuple[str, Callable[[], Callable]]]:
+    def speciate():
+        population = synthetic_population(size, random.Random(SEED))
+
+        def op():
+            population.species = []
+            for player in population.pop:
+                player.brain.sorted_genes = None
+            population.speciate()
+        return op
+
+    def generation(engine: str):
+        def setup():
+            random.seed(SEED)
+            brains = [player.brain for player in Population(size, engine).pop]
+
+            # A generation needs players that are alive, so every op gets
+            # fresh clones. Building them is not timed.
+            def prepare():
+                random.seed(SEED)
+                population = Population(0, engine)
+                for brain in brains:
+                    player = Player(brain.clone())
+                    player.brain.generate_network()
+                    population.pop.append(player)
+                return population, World(seed=SEED)
+
+            def op(prepared):
+                population, world = prepared
+                run_generation(population, world)
+                population.natural_selection(world)
+            return prepare, op
+        return setup
+
+    # Timing the numba kernels only means something once they are compiled
+    engines = [engine for engine in ENGINES if engine != "numba" or jit_kernels.AVAILABLE]
+    return [(f"speciate[{size} players]", speciate)] + [
+        (f"generation[{size} players, {engine}]", generation(engine)) for engine in engines]
+
+def all_benchmarks() -> List[Tuple[str, Callable[[], Callable]]]:
+    benchmarks = []
+    for genes in GENOME_SIZES:
+        benchmarks += genome_benchmarks(genes)
+    for size in POPULATION_SIZES:
+        benchmarks += population_benchmarks(size)
+    return benchmarks
+
+def measure(op: Callable, min_time: float, rounds: int,
+            prepare: Optional[Callable] = None) -> float:
+    """Best ops/sec over a few rounds of at least min_time seconds each.
+    With prepare, every op is called with what prepare() returns and only
+    the op is timed."""
+    best = 0.0
+    for _ in range(rounds):
+        count = 0
+        elapsed = 0.0
+        start = time.perf_counter()
+        while elapsed < min_time:
+            if prepare is None:
+                op()
+                elapsed = time.perf_counter() - start
+            else:
+                prepared = prepare()
+                op_start = time.perf_counter()
+                op(prepared)
+                elapsed += time.perf_counter() - op_start
+            count += 1
+        best = max(best, count / elapsed)
+    return best
+
+def peak_memory(op: Callable, prepare: Optional[Callable] = None) -> int:
+    """Peak bytes allocated while running op once"""
+    args = () if prepare is None else (prepare(),)
+    tracemalloc.start()
+    try:
+        op(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(name_filter: Optional[str] = None, min_time: float = 0.2, rounds: int = 3) -> Dict[str, dict]:
+    results = {}
+    for name, setup in all_benchmarks():
+        if name_filter and name_filter not in name:
+            continue
+        # A setup returns the op, or (prepare, op) if each op needs fresh input
+        op = setup()
+        prepare = None
+        if isinstance(op, tuple):
+            prepare, op = op
+        op(*(() if prepare is None else (prepare(),)))  # Warm up caches before timing
+        results[name] = {
+            'ops_per_sec': measure(op, min_time, rounds, prepare),
+            'peak_kb': peak_memory(op, prepare) / 1024,
+        }
+        print(f"{name:45} {results[name]['ops_per_sec']:14.1f} ops/sec "
+              f"{results[name]['peak_kb']:12.1f} KB peak", flush=True)
+    if not jit_kernels.AVAILABLE:
+        print("numba is not installed, the numba generation benchmarks were skipped")
+    return results
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Print the change against the baseline, returns the regressed benchmarks"""
+    regressions = []
+    print()
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:45} not in baseline")
+            continue
+        ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+        marker = ""
+        if ratio < 1 - tolerance:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:45} {ratio:6.2f}x baseline speed, "
+              f"{result['peak_kb'] - baseline[name]['peak_kb']:+10.1f} KB peak{marker}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NEAT core and the simulation loop")
+    parser.add_argument("--filter", default=None,
+                        help="only run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds each timing round runs for at least (default: 0.2)")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="timing rounds per benchmark, the best one counts (default: 3)")
+    parser.add_argument("--output", default=None,
+                        help="write the results as JSON, e.g. to use as a baseline later")
+    parser.add_argument("--baseline", default=None,
+                        help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="slowdown against the baseline still accepted (default: 0.2)")
+    args = parser.parse_args(argv)
+
+
+    if args.rounds < 1:
+        parser.error("--rounds must be at least 1")
+
+    results = run(args.filter, args.min_time, args.rounds)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline allows")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import queue
+import threading
+from typing import Optional
+from training_data import TrainingData
+from profiler import profiler
+
+class CheckpointWriter:
+    """Saves training data on a background thread.
+
+    save() only snapshots the new generations and queues them, encoding and
+    writing to disk happen on the writer thread. The queue holds at most
+    max_pending saves, when it is full save() waits for the writer instead
+    of piling up memory. A failed write is raised again on the next call
+    from the main thread.
+    """
+    def __init__(self, training_data: TrainingData, max_pending: int = 4):
+        self.training_data = training_data
+        self.queue = queue.Queue(max_pending)
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self.run, name="checkpoint-writer", daemon=True)
+        self.thread.start()
+
+    def save(self):
+        """Queue the generations added since the last save"""
+        self.raise_error()
+        records = self.training_data.take_unsaved()
+        if records:
+            self.queue.put(records)
+
+    def flush(self):
+        """Wait until every queued save is on disk"""
+        self.queue.join()
+        self.raise_error()
+
+    def close(self):
+        """Save what is left, wait for it and stop the writer thread"""
+        if not self.thread.is_alive():
+            return
+        try:
+            self.save()
+        finally:
+            self.queue.put(None)
+            self.thread.join()
+        self.raise_error()
+
+    def run(self):
+        while True:
+            records = self.queue.get()
+            try:
+                if records is None:
+                    return
+                if self.error is None:
+                    start = profiler.start()
+                    self.training_data.write_records(records)
+                    profiler.stop("write", start)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+    def raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
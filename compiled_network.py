@@ -0,0 +1,100 @@
+import math
+from typing import List
+
+class CompiledNetwork:
+    """A genome's network flattened into packed arrays for fast feed forward.
+
+    Nodes get a slot in network order (by layer), layer 0 first. Enabled
+    connections are sorted by the slot of their source node and, within a
+    source, kept in gene order, so sums are accumulated in exactly the same
+    order as Node.engage does and the outputs are identical.
+
+    feed_forward pulls instead of pushing: every slot past layer 0 holds a
+    tuple of (source slot, weight) pairs in that same order, so a sum is
+    one loop over a tuple with no index lookups per connection.
+    """
+    def __init__(self, node_order: List[int], node_layers: List[int], input_slots: List[int],
+                 bias_slot: int, output_slots: List[int], first_active: int,
+                 conn_src: List[int], conn_dst: List[int], conn_weight: List[float],
+                 conn_start: List[int]):
+        self.node_order = node_order      # node number in each slot
+        self.node_layers = node_layers    # layer of the node in each slot
+        self.input_slots = input_slots
+        self.bias_slot = bias_slot
+        self.output_slots = output_slots  # -1 if the output node is not in the network
+        self.first_active = first_active  # first slot past layer 0
+        self.conn_src = conn_src
+        self.conn_dst = conn_dst
+        self.conn_weight = conn_weight
+        self.conn_start = conn_start      # first connection of each slot, plus an end marker
+
+        incoming = [[] for _ in node_order]
+        for src, dst, weight in zip(conn_src, conn_dst, conn_weight):
+            incoming[dst].append((src, weight))
+        self.active = tuple((slot, tuple(incoming[slot]))
+                            for slot in range(first_active, len(node_order)))
+        self.inputs = tuple((slot, i) for i, slot in enumerate(input_slots) if slot != -1)
+        self.blank = [0.0] * len(node_order)
+        if bias_slot != -1:
+            self.blank[bias_slot] = 1
+
+    @classmethod
+    def from_genome(cls, genome) -> 'CompiledNetwork':
+        slot_of = {}
+        for node in genome.network:
+            slot_of[node.number] = len(slot_of)
+
+        node_order = [node.number for node in genome.network]
+        node_layers = [node.layer for node in genome.network]
+        first_active = sum(1 for layer in node_layers if layer == 0)
+
+        # Only the network's nodes are ever engaged, so connections touching
+        # anything else can never change an output
+        conns = []
+        for i, gene in enumerate(genome.genes):
+            if not gene.enabled:
+                continue
+            src = slot_of.get(gene.from_node.number)
+            dst = slot_of.get(gene.to_node.number)
+            if src is None or dst is None:
+                continue
+            conns.append((src, i, dst, gene.weight))
+        conns.sort()
+
+        conn_start = [0] * (len(node_order) + 1)
+        for src, _, _, _ in conns:
+            conn_start[src + 1] += 1
+        for slot in range(len(node_order)):
+            conn_start[slot + 1] += conn_start[slot]
+
+        return cls(
+            node_order,
+            node_layers,
+            [slot_of.get(i, -1) for i in range(genome.inputs)],
+            slot_of.get(genome.bias_node, -1),
+            [slot_of.get(genome.inputs + i, -1) for i in range(genome.outputs)],
+            first_active,
+            [c[0] for c in conns],
+            [c[2] for c in conns],
+            [c[3] for c in conns],
+            conn_start
+        )
+
+    def feed_forward(self, input_values: List[float]) -> List[float]:
+        values = self.blank[:]
+        for slot, i in self.inputs:
+            values[slot] = input_values[i]
+
+        exp = math.exp
+        for slot, incoming in self.active:
+            x = 0.0
+            for src, weight in incoming:
+                x += weight * values[src]
+            # Clamp the input to avoid overflow
+            if x > 60:
+                x = 60
+            elif x < -60:
+                x = -60
+            values[slot] = 1 / (1 + exp(-4.9 * x))
+
+        return [values[slot] if slot != -1 else 0 for slot in self.output_slots]
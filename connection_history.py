@@ -8,6 +8,7 @@ class ConnectionHistory:
         self.to_node = to_node
         self.innovation_number = innovation_no
         self.innovation_numbers = innovation_numbers.copy()
+        self.last_generation = 0  # Last generation this innovation was looked up in
 
     def matches(self, genome: 'Genome', from_node: Node, to_node: Node) -> bool:
         if len(genome.genes) != len(self.innovation_numbers):
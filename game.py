@@ -1,20 +1,36 @@
 import pygame
 import sys
 import os
-import random
+import time
+from typing import Optional
 from constants import *
 from player import Player
 from population import Population
-from obstacle import Obstacle
-from bird import Bird
-from ground import Ground
+from simulation import World
 from game_state import state
 from training_data import TrainingData
+from checkpoint_writer import CheckpointWriter
+from text_cache import TextCache
+from profiler import profiler, Profiler
 from menu_state import GameMode, state as menu_state
 
 # Define MAX_SPEED if not in constants
 MAX_SPEED = 20  # Adjust this value as needed
 
+HUD_COLOR = (100, 100, 100)
+INPUT_LABELS = [
+    "Distance to next obstacle",
+    "Height of obstacle",
+    "Width of obstacle",
+    "Bird height",
+    "Speed",
+    "Player's Y position",
+    "Gap between obstacles",
+    "Bias"
+]
+OUTPUT_LABELS = ["Small Jump", "Big Jump", "Duck"]
+PROFILE_OVERLAY_ROWS = 6
+
 class DinoGame:
     def __init__(self):
         pygame.init()
@@ -35,9 +51,13 @@ class DinoGame:
         self.accumulated_time = 0
         self.time_step = 1000 / DEFAULT_FPS  # in milliseconds
         self.training_data = TrainingData()
+        self.checkpoint_writer = CheckpointWriter(self.training_data)
         # Create training_data directory if it doesn't exist
         os.makedirs(os.path.join(os.path.dirname(__file__), 'training_data'), exist_ok=True)
-        self.menu_font = pygame.font.Font(None, 64)
+        self.text = TextCache()
+        # The network labels never change, render them once
+        self.input_label_surfaces = [self.text.render(label, 20, HUD_COLOR) for label in INPUT_LABELS]
+        self.output_label_surfaces = [self.text.render(label, 20, HUD_COLOR) for label in OUTPUT_LABELS]
         self.menu_buttons = [
             "Play as Human",
             f"Train AI ({GENERATIONS} generations)",
@@ -45,29 +65,43 @@ class DinoGame:
         ]
         self.selected_button = 0
         self.paused = False  # Add this line for pause functionality
+        self.turbo = False
+        self.turbo_ticks = 0  # Ticks simulated in the last turbo frame
+        self.brain_player = None  # Player whose network draw_brain shows
+        self.run_count = -5  # Run animation step shared by the population's dinos
+        # Dirty-rect rendering, see draw()
+        self.background = None
+        self.background_key = None  # (human mode, shown genome, its diagram)
+        self.panel_rect = pygame.Rect(0, 0, 0, 0)  # Area of the network panel
+        self.dirty_rects = []
 
     def load_assets(self):
-        self.images = {}
+        """Load the sprites and pack them side by side into one atlas. The
+        images are subsurfaces of the atlas, so they share its pixels."""
+        sprites = {}
         for key, path in SPRITE_PATHS.items():
             full_path = os.path.join(ASSETS_DIR, path)
-            self.images[key] = pygame.image.load(full_path).convert_alpha()
+            sprites[key] = pygame.image.load(full_path).convert_alpha()
+
+        width = sum(sprite.get_width() for sprite in sprites.values())
+        height = max(sprite.get_height() for sprite in sprites.values())
+        self.atlas = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+        self.atlas.fill((0, 0, 0, 0))
+        self.images = {}
+        x = 0
+        for key, sprite in sprites.items():
+            # Max blend onto the cleared atlas copies the pixels exactly
+            self.atlas.blit(sprite, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.images[key] = self.atlas.subsurface((x, 0, sprite.get_width(), sprite.get_height()))
+            x += sprite.get_width()
 
     def init_game(self):
         self.population = Population(500)  # 500 dinosaurs per generation
-        self.obstacles = []
-        self.birds = []
-        self.grounds = []
-        self.obstacle_timer = 0
-        self.minimum_time_between_obstacles = 60
-        self.random_addition = 0
-        self.ground_counter = 0
-        self.speed = 10
+        self.world = World(self.screen.get_width(), self.screen.get_height())
         self.frame_speed = 60
         self.show_best_each_gen = False
         self.show_nothing = False
-        self.obstacle_history = []
-        self.random_addition_history = []
-        self.player = Player()  # Single player for human mode
+        self.player = Player(ages=False)  # Single player for human mode
         menu_state.player = self.player  # Store reference globally
 
     def handle_events(self):
@@ -96,6 +130,12 @@ class DinoGame:
                 self.time_step = 1000 / self.frame_speed
             elif key == pygame.K_r:  # Add reset functionality
                 self.reset_game()
+            elif key == pygame.K_t:
+                self.turbo = not self.turbo
+            elif key == pygame.K_F3:
+                # Start or stop timing phases, shown in the HUD
+                profiler.enabled = not profiler.enabled
+                profiler.end_generation(self.population.gen)
 
     def update(self):
         """Update game state based on mode"""
@@ -104,9 +144,12 @@ class DinoGame:
             if self.paused:
                 return
             
-            self.update_obstacles()
+            self.world.update(self.population.population_life)
             if not self.player.dead:
-                self.player.update()
+                keys = pygame.key.get_pressed()
+                if not keys[pygame.K_DOWN]:
+                    self.player.reset_input()
+                self.player.update(self.world)
                 # Update score correctly - increment every frame instead of checking frame_speed
                 if self.frame_speed % 3 == 0:  # This was incorrectly checking frame_speed divisibility
                     self.player.score += 1
@@ -114,7 +157,7 @@ class DinoGame:
                 # Handle human player death - wait for spacebar to restart or backspace to return to menu
                 keys = pygame.key.get_pressed()
                 if keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_RETURN]:
-                    self.reset_obstacles()
+                    self.world.reset()
                     self.player.reset()
                 elif keys[pygame.K_BACKSPACE]:
                     # Return to main menu
@@ -122,213 +165,243 @@ class DinoGame:
                     self.selected_button = 0
         elif menu_state.current_mode == GameMode.PLAY_AI:
             # Special handling for playing trained AI
-            self.update_obstacles()
+            self.world.update(self.population.population_life)
             if not self.population.pop[0].dead:
                 # First look at environment
-                self.population.pop[0].look(self.obstacles, self.birds, self.speed)
+                self.population.pop[0].look(self.world)
                 # Then think and make decisions
                 self.population.pop[0].think()
                 # Finally update physics
-                self.population.pop[0].update()
+                self.population.pop[0].update(self.world)
                 
                 # Explicitly increment score for PLAY_AI mode
                 if self.frame_speed % 3 == 0:
                     self.population.pop[0].score += 1
                     
                 # Increase speed over time just like in other modes
-                if self.frame_speed % 5 == 0 and self.speed < 20:  # Using 20 as MAX_SPEED
-                    self.speed += 0.01
+                if self.frame_speed % 5 == 0 and self.world.speed < 20:  # Using 20 as MAX_SPEED
+                    self.world.speed += 0.01
             else:
                 # When AI dies, just reset the obstacles and position
-                self.reset_obstacles()
+                self.world.reset()
                 self.population.pop[0].reset()
         else:  # TRAIN_AI mode
             if self.population.gen >= GENERATIONS:
                 # Save final model and return to menu
-                self.training_data.save_to_file()
+                self.checkpoint_writer.save()
                 print("Training completed! 50 generations reached.")
                 menu_state.current_mode = GameMode.MENU
                 return
                 
             if not self.population_done():
-                self.update_obstacles()
-                self.population.update_alive()
+                start = profiler.start()
+                self.world.update(self.population.population_life)
+                profiler.stop("world", start)
+                self.population.update_alive(self.world)
             else:
-                self.population.natural_selection()
-                self.reset_obstacles()
-
-    def update_obstacles(self):
-        """Update obstacles, birds, and ground"""
-        self.obstacle_timer += 1
-        self.speed += SPEED_INCREMENT
-        
-        # Add new obstacle if timer is up
-        if self.obstacle_timer > self.minimum_time_between_obstacles + self.random_addition:
-            self.add_obstacle()
-            
-        # Add ground pieces
-        self.ground_counter += 1
-        if self.ground_counter > 10:
-            self.ground_counter = 0
-            self.grounds.append(Ground(self.screen.get_width(), self.screen.get_height()))
-            
-        # Move and show everything
-        self.move_obstacles()
-        if not self.show_nothing:
-            self.show_obstacles()
-
-    def move_obstacles(self):
-        """Move obstacles, birds, and ground pieces"""
-        # Move and remove off-screen obstacles
-        for obstacle in self.obstacles[:]:
-            obstacle.move(self.speed)
-            if obstacle.pos_x < -PLAYER_XPOS:
-                self.obstacles.remove(obstacle)
-                
-        # Move and remove off-screen birds
-        for bird in self.birds[:]:
-            bird.move(self.speed)
-            if bird.pos_x < -PLAYER_XPOS:
-                self.birds.remove(bird)
-                
-        # Move and remove off-screen ground pieces
-        for ground in self.grounds[:]:
-            ground.move(self.speed)
-            if ground.pos_x < -PLAYER_XPOS:
-                self.grounds.remove(ground)
-
-    def add_obstacle(self):
-        """Add a new obstacle or bird"""
-        lifespan = self.population.population_life
-        temp_int = 0
-        
-        # 15% chance for bird after 1000 lifespan
-        if lifespan > 1000 and random.random() < 0.15:
-            temp_int = random.randint(0, 2)
-            self.birds.append(Bird(temp_int, self.screen.get_width(), self.images["bird"], self.images["bird1"]))
-        else:
-            temp_int = random.randint(0, 2)
-            self.obstacles.append(Obstacle(temp_int, self.screen.get_width(), self.images))
-            temp_int += 3
-            
-        self.obstacle_history.append(temp_int)
-        self.random_addition = random.randint(0, 50)
-        self.random_addition_history.append(self.random_addition)
-        self.obstacle_timer = 0
+                self.population.natural_selection(self.world)
+                profiler.end_generation(self.population.gen - 1,
+                                        Profiler.output_path(self.training_data.file_path))
+                self.world.reset()
 
-    def show_obstacles(self):
-        """Draw all game objects"""
+    def show_obstacles(self) -> list:
+        """Draw all game objects, returns the rects drawn to"""
+        rects = []
         # Draw ground, obstacles, and birds
-        for ground in self.grounds:
-            ground.show(self.screen)
+        for ground in self.world.grounds:
+            rects.append(ground.show(self.screen))
             
-        for obstacle in self.obstacles:
-            obstacle.show(self.screen, GROUND_HEIGHT)
+        for obstacle in self.world.obstacles:
+            rects.append(obstacle.show(self.screen, GROUND_HEIGHT, self.images))
             
-        for bird in self.birds:
-            bird.show(self.screen, GROUND_HEIGHT)
+        for bird in self.world.birds:
+            rects.append(bird.show(self.screen, GROUND_HEIGHT, self.images))
             
         # Draw player or AI based on mode
         if menu_state.current_mode == menu_state.GameMode.PLAYER:
             if not self.player.dead:
-                self.player.show(self.screen, self.images)
+                rects.append(self.player.show(self.screen, self.images))
         else:
-            for player in self.population.pop:
-                if not player.dead:
-                    player.show(self.screen, self.images)
-
-    def reset_obstacles(self):
-        """Reset all obstacles and game state"""
-        self.random_addition_history.clear()
-        self.obstacle_history.clear()
-        self.obstacles.clear()
-        self.birds.clear()
-        self.grounds.clear()
-        self.obstacle_timer = 0
-        self.random_addition = 0
-        self.ground_counter = 0
-        self.speed = 10
+            rects.extend(self.show_population())
+        return rects
+
+    def alive_players(self, limit: Optional[int] = None) -> list:
+        """Living AI players, only the first limit of them if given.
+        Training tracks them in the population, the single PLAY_AI player is
+        stepped by the game itself."""
+        if menu_state.current_mode == GameMode.TRAIN_AI:
+            return self.population.alive_players(limit)
+        return [player for player in self.population.pop if not player.dead][:limit]
+
+    def alive_count(self) -> int:
+        if menu_state.current_mode == GameMode.TRAIN_AI:
+            return self.population.alive_count()
+        return len(self.alive_players())
+
+    def show_population(self) -> list:
+        """Draw at most MAX_DRAWN_DINOS alive dinos, one per distinct pose,
+        and the number of the others. Dinos in the same pose overlap
+        exactly, so one of them looks the same as all of them. Only the
+        first MAX_DRAWN_CANDIDATES alive dinos are looked at, so drawing
+        costs the same for any population size."""
+        ground_y = self.screen.get_height() - GROUND_HEIGHT
+        poses = set()
+        sprites = []
+        for player in self.alive_players(MAX_DRAWN_CANDIDATES):
+            if len(sprites) == MAX_DRAWN_DINOS:
+                break
+            name = player.sprite_name(self.run_count)
+            if (name, player.pos_y) in poses:
+                continue
+            poses.add((name, player.pos_y))
+            image = self.images[name]
+            sprites.append((image, (PLAYER_XPOS - image.get_width()/2,
+                                    ground_y - (player.pos_y + image.get_height()))))
+        rects = self.screen.blits(sprites)
+
+        hidden = self.alive_count() - len(sprites)
+        if hidden:
+            count_surface = self.text.render(f"+{hidden}", 20, HUD_COLOR)
+            rects.append(self.screen.blit(count_surface, (PLAYER_XPOS + DINO_RUN_WIDTH/2 + 10,
+                                                          ground_y - DINO_RUN_HEIGHT)))
+
+        self.run_count += 1
+        if self.run_count > 5:
+            self.run_count = -5
+        return rects
 
     def draw(self):
-        if not self.show_nothing:
-            self.screen.fill((250, 250, 250))
-            
-            # Draw ground line at bottom
-            ground_y = self.screen.get_height() - GROUND_HEIGHT
-            pygame.draw.line(self.screen, (0, 0, 0), 
-                           (0, ground_y),
-                           (self.screen.get_width(), ground_y), 
-                           2)
-                           
-            # Draw everything else
-            self.show_obstacles()
-            self.draw_brain()
-            self.draw_info()
+        """Draw a frame. Only the rects drawn to in this frame or the last
+        one are restored from the background and sent to the display."""
+        if self.show_nothing:
+            return
+
+        genome = self.shown_genome()
+        human = menu_state.current_mode == GameMode.PLAYER
+        key = (human, genome, genome.diagram if genome else None)
+        full_redraw = self.background_key is None or self.background_key[0] != human
+        panel_changed = not full_redraw and key != self.background_key
+        if full_redraw or panel_changed:
+            # Mode or network changed, render the static parts again
+            self.background = self.render_background(genome)
+            self.background_key = (human, genome, genome.diagram if genome else None)
+
+        if full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            # Erase what was drawn last frame
+            for rect in self.dirty_rects:
+                self.screen.blit(self.background, rect, rect)
+            if panel_changed:
+                self.screen.blit(self.background, self.panel_rect, self.panel_rect)
+                self.dirty_rects.append(self.panel_rect)
+
+        # Draw everything that moves or changes
+        rects = self.show_obstacles()
+        rects.extend(self.draw_info())
             
-            # Draw "Game Over" message and restart prompt for human player
-            if menu_state.current_mode == GameMode.PLAYER and self.player.dead:
-                font = pygame.font.Font(None, 64)
-                game_over = font.render("Game Over", True, (255, 0, 0))
-                restart = font.render("Press SPACE to restart", True, (0, 0, 0))
-                menu_return = font.render("Press BACKSPACE for menu", True, (0, 0, 0))
-                
-                self.screen.blit(game_over, 
-                               (self.screen.get_width()//2 - game_over.get_width()//2, 
-                                self.screen.get_height()//3))
-                self.screen.blit(restart, 
-                               (self.screen.get_width()//2 - restart.get_width()//2, 
-                                self.screen.get_height()//2))
-                self.screen.blit(menu_return, 
-                               (self.screen.get_width()//2 - menu_return.get_width()//2, 
-                                self.screen.get_height()//2 + 70))
+        # Draw "Game Over" message and restart prompt for human player
+        if menu_state.current_mode == GameMode.PLAYER and self.player.dead:
+            game_over = self.text.render("Game Over", 64, (255, 0, 0))
+            restart = self.text.render("Press SPACE to restart", 64, (0, 0, 0))
+            menu_return = self.text.render("Press BACKSPACE for menu", 64, (0, 0, 0))
             
-            # Show pause message when game is paused
-            if menu_state.current_mode == GameMode.PLAYER and self.paused:
-                font = pygame.font.Font(None, 64)
-                pause_text = font.render("PAUSED", True, (0, 0, 255))
-                continue_text = font.render("Press P to continue", True, (0, 0, 0))
-                
-                self.screen.blit(pause_text, 
-                               (self.screen.get_width()//2 - pause_text.get_width()//2, 
-                                self.screen.get_height()//3))
-                self.screen.blit(continue_text, 
-                               (self.screen.get_width()//2 - continue_text.get_width()//2, 
-                                self.screen.get_height()//2))
+            rects.append(self.screen.blit(game_over, 
+                           (self.screen.get_width()//2 - game_over.get_width()//2, 
+                            self.screen.get_height()//3)))
+            rects.append(self.screen.blit(restart, 
+                           (self.screen.get_width()//2 - restart.get_width()//2, 
+                            self.screen.get_height()//2)))
+            rects.append(self.screen.blit(menu_return, 
+                           (self.screen.get_width()//2 - menu_return.get_width()//2, 
+                            self.screen.get_height()//2 + 70)))
+        
+        # Show pause message when game is paused
+        if menu_state.current_mode == GameMode.PLAYER and self.paused:
+            pause_text = self.text.render("PAUSED", 64, (0, 0, 255))
+            continue_text = self.text.render("Press P to continue", 64, (0, 0, 0))
             
+            rects.append(self.screen.blit(pause_text, 
+                           (self.screen.get_width()//2 - pause_text.get_width()//2, 
+                            self.screen.get_height()//3)))
+            rects.append(self.screen.blit(continue_text, 
+                           (self.screen.get_width()//2 - continue_text.get_width()//2, 
+                            self.screen.get_height()//2)))
+
+        if full_redraw:
             pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects + rects)
+        self.dirty_rects = rects
 
-    def draw_brain(self):
-        """Draw the neural network visualization"""
-        # Skip drawing neural network in human player mode
+    def render_background(self, genome) -> pygame.Surface:
+        """Everything that stays put between frames: the fill, the ground
+        line and in AI modes the network panel"""
+        background = pygame.Surface(self.screen.get_size()).convert()
+        background.fill((250, 250, 250))
+        
+        # Draw ground line at bottom
+        ground_y = self.screen.get_height() - GROUND_HEIGHT
+        pygame.draw.line(background, (0, 0, 0), 
+                       (0, ground_y),
+                       (self.screen.get_width(), ground_y), 
+                       2)
+
+        if menu_state.current_mode != GameMode.PLAYER:
+            self.panel_rect = self.draw_brain(background, genome)
+        return background
+
+    def shown_genome(self):
+        """Genome of the network panel, None in human player mode"""
         if menu_state.current_mode == GameMode.PLAYER:
-            return
-            
-        if not self.show_nothing:
-            # Position network visualization on right side of screen
-            start_x = self.screen.get_width() - NETWORK_WIDTH - 100
-            start_y = NETWORK_MARGIN_Y
-            
-            # Draw background for network
-            pygame.draw.rect(self.screen, (240, 240, 240), 
-                           (start_x - 10, start_y - 10, 
-                            NETWORK_WIDTH + 20, NETWORK_HEIGHT + 20))
-            
-            # Draw network
-            if self.show_best_each_gen:
-                self.gen_player_temp.brain.draw_genome(self.screen, 
-                    start_x, start_y, NETWORK_WIDTH, NETWORK_HEIGHT)
-            else:
-                for player in self.population.pop:
-                    if not player.dead:
-                        player.brain.draw_genome(self.screen, 
-                            start_x, start_y, NETWORK_WIDTH, NETWORK_HEIGHT)
-                        break
-
-    def draw_info(self):
-        """Draw game information"""
-        font = pygame.font.Font(None, 40)
-        small_font = pygame.font.Font(None, 20)
+            return None
+        if self.show_best_each_gen:
+            return self.gen_player_temp.brain
+
+        alive = self.alive_players(1)
+        player = alive[0] if alive else None
+        if player is not self.brain_player:
+            # The shown player died, drop its cached diagram
+            if self.brain_player is not None:
+                self.brain_player.brain.diagram = None
+            self.brain_player = player
+        return player.brain if player is not None else None
+
+    def draw_brain(self, surface, genome) -> pygame.Rect:
+        """Draw the neural network visualization and its labels, returns
+        the area drawn to"""
+        # Position network visualization on right side of screen
+        start_x = self.screen.get_width() - NETWORK_WIDTH - 100
+        start_y = NETWORK_MARGIN_Y
         
+        # Draw background for network
+        area = pygame.draw.rect(surface, (240, 240, 240), 
+                       (start_x - 10, start_y - 10, 
+                        NETWORK_WIDTH + 20, NETWORK_HEIGHT + 20))
+        
+        # Draw network
+        if genome is not None:
+            area.union_ip(genome.draw_genome(surface, start_x, start_y,
+                                             NETWORK_WIDTH, NETWORK_HEIGHT))
+
+        # Draw neural network labels
+        network_x = self.screen.get_width() - NETWORK_WIDTH - 150
+        for i, label_surface in enumerate(self.input_label_surfaces):
+            area.union_ip(surface.blit(label_surface, 
+                (network_x, NETWORK_MARGIN_Y + (i+1)*44)))
+
+        # Draw output labels on right side
+        for i, label_surface in enumerate(self.output_label_surfaces):
+            area.union_ip(surface.blit(label_surface, 
+                (self.screen.get_width() - 200, 
+                 NETWORK_MARGIN_Y + 100 + i*100)))
+        return area
+
+    def draw_info(self) -> list:
+        """Draw game information, returns the rects drawn to. Texts come
+        from the text cache, so numbers are only rendered again when they
+        change."""
+        rects = []
         # Draw score with proper handling for all modes
         if menu_state.current_mode == GameMode.PLAYER:
             score_text = f"Score: {self.player.score}"
@@ -339,50 +412,36 @@ class DinoGame:
             # For TRAIN_AI mode
             score_text = f"Score: {self.population.population_life//3 if not self.show_best_each_gen else self.gen_player_temp.score}"
         
-        score_surface = font.render(score_text, True, (100, 100, 100))
-        self.screen.blit(score_surface, (30, self.screen.get_height() - 30))
+        score_surface = self.text.render(score_text, 40, HUD_COLOR)
+        rects.append(self.screen.blit(score_surface, (30, self.screen.get_height() - 30)))
         
         # Draw generation - only for AI modes
         if menu_state.current_mode != GameMode.PLAYER:
+            if self.turbo:
+                turbo_surface = self.text.render(f"Turbo: {self.turbo_ticks} ticks/frame",
+                                                 20, HUD_COLOR)
+                rects.append(self.screen.blit(turbo_surface, (30, self.screen.get_height() - 60)))
+
             gen_text = f"Gen: {self.population.gen + 1}"
-            gen_surface = font.render(gen_text, True, (100, 100, 100))
-            self.screen.blit(gen_surface, (self.screen.get_width() - 40 - gen_surface.get_width(), 
-                                         self.screen.get_height() - 30))
+            gen_surface = self.text.render(gen_text, 40, HUD_COLOR)
+            rects.append(self.screen.blit(gen_surface, (self.screen.get_width() - 40 - gen_surface.get_width(), 
+                                         self.screen.get_height() - 30)))
             
             # Add Dino Alive counter for TRAIN_AI mode
             if menu_state.current_mode == GameMode.TRAIN_AI:
-                alive_count = sum(1 for player in self.population.pop if not player.dead)
+                alive_count = self.population.alive_count()
                 dino_alive_text = f"Dino Alive: {alive_count}/{len(self.population.pop)}"
-                dino_alive_surface = font.render(dino_alive_text, True, (100, 100, 100))
-                self.screen.blit(dino_alive_surface, (self.screen.get_width() // 2 - dino_alive_surface.get_width() // 2, 
-                                                  self.screen.get_height() - 30))
+                dino_alive_surface = self.text.render(dino_alive_text, 40, HUD_COLOR)
+                rects.append(self.screen.blit(dino_alive_surface, (self.screen.get_width() // 2 - dino_alive_surface.get_width() // 2, 
+                                                  self.screen.get_height() - 30)))
 
-        # Draw neural network labels - only for AI modes
-        if menu_state.current_mode != GameMode.PLAYER:
-            labels = [
-                "Distance to next obstacle",
-                "Height of obstacle",
-                "Width of obstacle",
-                "Bird height",
-                "Speed",
-                "Player's Y position",
-                "Gap between obstacles",
-                "Bias"
-            ]
-            
-            network_x = self.screen.get_width() - NETWORK_WIDTH - 150
-            for i, label in enumerate(labels):
-                label_surface = small_font.render(label, True, (100, 100, 100))
-                self.screen.blit(label_surface, 
-                    (network_x, NETWORK_MARGIN_Y + (i+1)*44))
-
-            # Draw output labels on right side
-            output_labels = ["Small Jump", "Big Jump", "Duck"]
-            for i, label in enumerate(output_labels):
-                label_surface = small_font.render(label, True, (100, 100, 100))
-                self.screen.blit(label_surface, 
-                    (self.screen.get_width() - 200, 
-                     NETWORK_MARGIN_Y + 100 + i*100))
+            # Most expensive phases of this generation while profiling
+            if profiler.enabled:
+                for i, (phase, total, mean) in enumerate(profiler.totals()[:PROFILE_OVERLAY_ROWS]):
+                    phase_surface = self.text.render(
+                        f"{phase}: {total*1000:.0f} ms total, {mean*1000:.2f} ms mean", 20, HUD_COLOR)
+                    rects.append(self.screen.blit(phase_surface, (30, 30 + i*20)))
+        return rects
 
     def run(self):
         running = True
@@ -400,26 +459,49 @@ class DinoGame:
                 # Handle events regardless of accumulated time
                 running = self.handle_events()
 
-                # Update game state based on accumulated time
-                while self.accumulated_time >= self.time_step:
-                    self.update()
-                    self.accumulated_time -= self.time_step
+                # Update game state, then draw once per frame
+                turbo = self.turbo and menu_state.current_mode != GameMode.PLAYER
+                if turbo:
+                    self.run_turbo_ticks()
+                else:
+                    self.run_fixed_steps()
 
-                # Always draw
+                start = profiler.start()
                 self.draw()
+                profiler.stop("draw", start)
                 
                 # Limit FPS
-                self.clock.tick(self.frame_speed)
+                self.clock.tick(DEFAULT_FPS if turbo else self.frame_speed)
 
+        self.checkpoint_writer.close()  # Finish writing queued generations
         pygame.quit()
         sys.exit()
 
+    def run_fixed_steps(self):
+        """Catch up on the elapsed time with fixed time steps"""
+        steps = 0
+        while self.accumulated_time >= self.time_step:
+            if steps == MAX_CATCH_UP_STEPS:
+                # Drop the backlog instead of falling further behind
+                self.accumulated_time = 0
+                break
+            self.update()
+            self.accumulated_time -= self.time_step
+            steps += 1
+
+    def run_turbo_ticks(self):
+        """Run as many updates as fit in the frame budget"""
+        self.accumulated_time = 0
+        mode = menu_state.current_mode
+        deadline = time.perf_counter() + TURBO_FRAME_BUDGET_MS / 1000
+        self.turbo_ticks = 0
+        while menu_state.current_mode == mode and time.perf_counter() < deadline:
+            self.update()
+            self.turbo_ticks += 1
+
     def reset_game(self):
         """Reset the game state"""
-        self.speed = 10
-        self.obstacle_timer = 0
-        self.random_addition = 0
-        self.reset_obstacles()
+        self.world.reset()
         self.population = Population(500)
 
     def population_done(self):
@@ -439,27 +521,26 @@ class DinoGame:
                 best_player.decision_history
             )
             
-            # Save after each generation
-            self.training_data.save_to_file()
+            # Save after each generation, written in the background
+            start = profiler.start()
+            self.checkpoint_writer.save()
+            profiler.stop("save", start)
             return True
         return False
 
     def load_trained_ai(self):
         """Load the last generation's AI model"""
         try:
-            self.training_data.load_from_file()
-            
-            # Get last generation number
-            last_gen = max(self.training_data.data.keys())
-            last_gen_data = self.training_data.data[last_gen]
+            self.checkpoint_writer.flush()
+            # Only the last generation is decoded
+            last_gen, last_gen_data = self.training_data.load_generation()
             
             # Initialize AI with last generation's data
-            self.reset_obstacles()  # Clear any existing obstacles
+            self.world.reset()  # Clear any existing obstacles and reset speed
             self.population = Population(1)  # Single player for demo
             self.population.gen = last_gen
             self.population.pop[0].brain = last_gen_data['best_genome'].clone()
             self.population.pop[0].brain.generate_network()  # Make sure network is generated
-            self.speed = 10  # Reset speed
             
             print(f"Loaded AI from last generation (Gen {last_gen}) with score {last_gen_data['best_score']}")
             
@@ -468,17 +549,18 @@ class DinoGame:
             raise e
 
     def draw_menu(self):
+        self.background_key = None  # The next game frame is drawn in full
         self.screen.fill((250, 250, 250))
         
         # Draw title
-        title = self.menu_font.render("Dino Game AI", True, (0, 0, 0))
+        title = self.text.render("Dino Game AI", 64, (0, 0, 0))
         title_rect = title.get_rect(center=(self.screen.get_width()//2, 200))
         self.screen.blit(title, title_rect)
         
         # Draw buttons
         for i, text in enumerate(self.menu_buttons):
             color = (255, 0, 0) if i == self.selected_button else (0, 0, 0)
-            button = self.menu_font.render(text, True, color)
+            button = self.text.render(text, 64, color)
             button_rect = button.get_rect(center=(self.screen.get_width()//2, 400 + i * 100))
             self.screen.blit(button, button_rect)
         
@@ -510,10 +592,9 @@ class DinoGame:
 
     def init_human_game(self):
         """Initialize game for human player"""
-        self.reset_obstacles()
-        self.player = Player()
+        self.world.reset()
+        self.player = Player(ages=False)
         menu_state.player = self.player
-        self.speed = 10
 
 if __name__ == "__main__":
     game = DinoGame()
@@ -1,9 +1,12 @@
 import random
-from typing import List, Optional
+from array import array
+from typing import List, Optional, Tuple
 from node import Node
 from connection_gene import ConnectionGene
-from connection_history import ConnectionHistory
-from globals import next_connection_no
+from compiled_network import CompiledNetwork
+from innovation_registry import InnovationRegistry
+
+DIAGRAM_MARGIN = 12  # Room around the diagram for node circles on its edges
 
 class Genome:
     def __init__(self, inputs: int, outputs: int, clone: bool = False):
@@ -14,6 +17,9 @@ class Genome:
         self.layers = 2
         self.next_node = 0
         self.network: List[Node] = []
+        self.compiled: Optional[CompiledNetwork] = None
+        self.sorted_genes: Optional[Tuple[List[int], List[float]]] = None
+        self.diagram = None  # pygame Surface drawn by draw_genome
 
         if not clone:
             # Create input nodes
@@ -34,6 +40,18 @@ class Genome:
             self.next_node += 1
             self.nodes[-1].layer = 0
 
+    def clear_caches(self):
+        """Genes changed, recompile, re-sort and redraw them when next needed"""
+        self.compiled = None
+        self.sorted_genes = None
+        self.diagram = None
+
+    def __getstate__(self):
+        # Surfaces can't be pickled, the diagram is redrawn on demand
+        state = self.__dict__.copy()
+        state['diagram'] = None
+        return state
+
     def connect_nodes(self):
         for node in self.nodes:
             node.output_connections.clear()
@@ -63,24 +81,63 @@ class Genome:
 
         return outputs
 
-    def get_innovation_number(self, innovation_history: List[ConnectionHistory], 
+    def compile(self) -> CompiledNetwork:
+        """Flatten the current network into a CompiledNetwork"""
+        self.compiled = CompiledNetwork.from_genome(self)
+        return self.compiled
+
+    def compiled_feed_forward(self, input_values: List[float]) -> List[float]:
+        """Same outputs as feed_forward, computed by the compiled network"""
+        if self.compiled is None:
+            self.compile()
+        return self.compiled.feed_forward(input_values)
+
+    def gene_arrays(self) -> Tuple[List[int], List[float]]:
+        """Innovation numbers and weights of the genes, sorted by innovation
+        number. Cached until the genome changes."""
+        if self.sorted_genes is None:
+            pairs = sorted((gene.innovation_no, gene.weight) for gene in self.genes)
+            self.sorted_genes = ([p[0] for p in pairs], [p[1] for p in pairs])
+        return self.sorted_genes
+
+    def to_arrays(self) -> Tuple[array, ...]:
+        """Nodes and genes as flat arrays: node numbers, node layers, gene
+        from/to node numbers, innovation numbers, weights and enabled flags"""
+        genes = self.genes
+        return (array('i', [node.number for node in self.nodes]),
+                array('i', [node.layer for node in self.nodes]),
+                array('i', [gene.from_node.number for gene in genes]),
+                array('i', [gene.to_node.number for gene in genes]),
+                array('q', [gene.innovation_no for gene in genes]),
+                array('d', [gene.weight for gene in genes]),
+                array('b', [gene.enabled for gene in genes]))
+
+    @classmethod
+    def from_arrays(cls, inputs: int, outputs: int, layers: int, next_node: int, bias_node: int,
+                    node_numbers, node_layers, gene_from, gene_to,
+                    innovations, weights, enabled) -> 'Genome':
+        """Rebuild a genome from the arrays made by to_arrays"""
+        genome = cls(inputs, outputs, True)
+        genome.layers = layers
+        genome.next_node = next_node
+        genome.bias_node = bias_node
+        for number, layer in zip(node_numbers, node_layers):
+            node = Node(number)
+            node.layer = layer
+            genome.nodes.append(node)
+
+        get_node = genome.get_node
+        for i in range(len(innovations)):
+            gene = ConnectionGene(get_node(gene_from[i]), get_node(gene_to[i]),
+                                  weights[i], innovations[i])
+            gene.enabled = bool(enabled[i])
+            genome.genes.append(gene)
+            gene.from_node.output_connections.append(gene)
+        return genome
+
+    def get_innovation_number(self, innovation_history: InnovationRegistry,
                             from_node: Node, to_node: Node) -> int:
-        is_new = True
-        global next_connection_no
-
-        # Check if this mutation has happened before
-        for hist in innovation_history:
-            if hist.matches(self, from_node, to_node):
-                is_new = False
-                return hist.innovation_number
-
-        if is_new:
-            # Create new innovation
-            inno_numbers = [gene.innovation_no for gene in self.genes]
-            innovation_history.append(ConnectionHistory(
-                from_node.number, to_node.number, next_connection_no, inno_numbers))
-            next_connection_no += 1
-            return next_connection_no - 1
+        return innovation_history.get_innovation_number(self, from_node, to_node)
 
     def fully_connected(self) -> bool:
         max_connections = 0
@@ -97,11 +154,13 @@ class Genome:
 
         return len(self.genes) == max_connections
 
-    def mutate(self, innovation_history: List[ConnectionHistory]):
+    def mutate(self, innovation_history: InnovationRegistry):
         if not self.genes:
             self.add_connection(innovation_history)
             return
 
+        self.clear_caches()
+
         # 80% chance to mutate weights
         if random.random() < 0.8:
             for gene in self.genes:
@@ -123,12 +182,16 @@ class Genome:
         child.next_node = self.next_node
         child.bias_node = self.bias_node
 
-        for node in self.nodes:
-            child.nodes.append(node.clone())
+        child.nodes = [node.clone() for node in self.nodes]
+
+        # Same lookup as matching_gene, without scanning parent2 for every gene
+        parent2_index = {}
+        for i, gene in enumerate(parent2.genes):
+            parent2_index.setdefault(gene.innovation_no, i)
 
         for gene in self.genes:
             set_enabled = True
-            parent2_gene = self.matching_gene(parent2, gene.innovation_no)
+            parent2_gene = parent2_index.get(gene.innovation_no, -1)
 
             if parent2_gene != -1:  # Matching gene found
                 if not gene.enabled or not parent2.genes[parent2_gene].enabled:
@@ -153,31 +216,41 @@ class Genome:
 
     def clone(self) -> 'Genome':
         clone = Genome(self.inputs, self.outputs, True)
-        
-        for node in self.nodes:
-            clone.nodes.append(node.clone())
+        clone.nodes = [node.clone() for node in self.nodes]
 
+        # Clone genes and wire up output connections in the same pass
+        # instead of a separate connect_nodes()
+        get_node = clone.get_node
         for gene in self.genes:
-            clone.genes.append(gene.clone(
-                clone.get_node(gene.from_node.number),
-                clone.get_node(gene.to_node.number)))
+            clone_gene = gene.clone(get_node(gene.from_node.number), get_node(gene.to_node.number))
+            clone.genes.append(clone_gene)
+            clone_gene.from_node.output_connections.append(clone_gene)
 
         clone.layers = self.layers
         clone.next_node = self.next_node
         clone.bias_node = self.bias_node
-        clone.connect_nodes()
         return clone
 
     def get_node(self, node_number: int) -> Optional[Node]:
         """Returns the node with a matching number"""
+        # Nodes are numbered in the order they are created, so the number
+        # is normally the node's index
+        if 0 <= node_number < len(self.nodes):
+            node = self.nodes[node_number]
+            if node.number == node_number:
+                return node
+
         for node in self.nodes:
             if node.number == node_number:
                 return node
         return None
 
-    def generate_network(self):
-        """Sets up the neural network as a list of nodes in order to be engaged"""
-        self.connect_nodes()
+    def generate_network(self, connect: bool = True):
+        """Sets up the neural network as a list of nodes in order to be engaged.
+        connect=False skips rebuilding the output connections, for genomes
+        that clone, crossover or a structural mutation already wired up."""
+        if connect:
+            self.connect_nodes()
         self.network.clear()
         
         # For each layer add the nodes in that layer
@@ -187,7 +260,11 @@ class Genome:
                 if node.layer == layer:
                     self.network.append(node)
 
-    def add_node(self, innovation_history: List[ConnectionHistory]):
+        # Compiled lazily on the next feed forward, the genome is often
+        # mutated before it runs
+        self.compiled = None
+
+    def add_node(self, innovation_history: InnovationRegistry):
         """Mutate the network by adding a new node"""
         # If there are no connections, add one
         if not self.genes:
@@ -264,8 +341,9 @@ class Genome:
             self.layers += 1
 
         self.connect_nodes()
+        self.clear_caches()
 
-    def add_connection(self, innovation_history: List[ConnectionHistory]):
+    def add_connection(self, innovation_history: InnovationRegistry):
         """Adds a connection between 2 nodes that aren't currently connected"""
         if self.fully_connected():
             return
@@ -297,6 +375,7 @@ class Genome:
         ))
         
         self.connect_nodes()
+        self.clear_caches()
 
     def random_connection_nodes_are_bad(self, r1: int, r2: int) -> bool:
         """Check if the random nodes selected for a new connection are valid"""
@@ -307,11 +386,30 @@ class Genome:
         return False
 
     def draw_genome(self, screen, start_x: int, start_y: int, width: int, height: int):
-        """Draw the genome as a neural network visualization"""
+        """Draw the genome as a neural network visualization, returns the
+        area drawn to.
+
+        The diagram is rendered once into a surface and only blitted after
+        that, until the genes change or the size does.
+        """
+        margin = DIAGRAM_MARGIN
+        size = (width + 2*margin, height + 2*margin)
+        if self.diagram is None or self.diagram.get_size() != size:
+            self.diagram = self.render_diagram(width, height)
+        return screen.blit(self.diagram, (start_x - margin, start_y - margin))
+
+    def render_diagram(self, width: int, height: int):
+        """Render the network into a new transparent surface"""
         import pygame
+
+        margin = DIAGRAM_MARGIN
+        surface = pygame.Surface((width + 2*margin, height + 2*margin), pygame.SRCALPHA)
+        start_x = start_y = margin
+        font = pygame.font.Font(None, 20)
         
         # Calculate node positions for each layer
         node_positions = []  # [(x, y, node_number)]
+        draw_pos = {}  # node number -> (x, y)
         layer_nodes = [[] for _ in range(self.layers)]
         
         # Group nodes by layer
@@ -326,8 +424,7 @@ class Genome:
             for i, node in enumerate(nodes_in_layer):
                 layer_y = start_y + ((i + 1) * height) / (len(nodes_in_layer) + 1)
                 node_positions.append((layer_x, layer_y, node.number))
-                node.draw_pos.x = layer_x
-                node.draw_pos.y = layer_y
+                draw_pos[node.number] = (layer_x, layer_y)
 
         # Draw connections
         for gene in self.genes:
@@ -335,22 +432,23 @@ class Genome:
                 color = (255, 0, 0) if gene.weight > 0 else (0, 0, 255)  # Red for positive, blue for negative
                 weight_thickness = abs(int(gene.weight * 5))  # Thickness based on weight
                 
-                pygame.draw.line(screen, color,
-                               (gene.from_node.draw_pos.x, gene.from_node.draw_pos.y),
-                               (gene.to_node.draw_pos.x, gene.to_node.draw_pos.y),
+                pygame.draw.line(surface, color,
+                               draw_pos[gene.from_node.number],
+                               draw_pos[gene.to_node.number],
                                max(1, weight_thickness))
 
         # Draw nodes
         for x, y, node_num in node_positions:
             # Draw node circle
-            pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), 10)
-            pygame.draw.circle(screen, (0, 0, 0), (int(x), int(y)), 10, 1)
+            pygame.draw.circle(surface, (255, 255, 255), (int(x), int(y)), 10)
+            pygame.draw.circle(surface, (0, 0, 0), (int(x), int(y)), 10, 1)
             
             # Draw node number
-            font = pygame.font.Font(None, 20)
             text = font.render(str(node_num), True, (0, 0, 0))
             text_rect = text.get_rect(center=(x, y))
-            screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
+
+        return surface
 
     def matching_gene(self, parent2: 'Genome', innovation_number: int) -> int:
         """Returns the index of the gene in parent2 with the matching innovation number, or -1 if not found"""
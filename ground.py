@@ -1,15 +1,20 @@
-import random
-import pygame
 from constants import GROUND_HEIGHT
 
 class Ground:
-    def __init__(self, width, height):
+    def __init__(self, width, height, offset, w):
+        self.spawn(width, height, offset, w)
+
+    def spawn(self, width, height, offset, w):
+        """(Re)start as a new ground piece at the right edge, lets the world
+        reuse instances"""
         self.pos_x = width
-        self.pos_y = height - GROUND_HEIGHT + random.randint(-20, 30)
-        self.w = random.randint(1, 10)
+        self.pos_y = height - GROUND_HEIGHT + offset
+        self.w = w
 
     def show(self, screen):
-        pygame.draw.line(screen, (0, 0, 0), 
+        import pygame
+
+        return pygame.draw.line(screen, (0, 0, 0), 
                         (self.pos_x, self.pos_y),
                         (self.pos_x + self.w, self.pos_y),
                         3)
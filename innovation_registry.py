@@ -0,0 +1,57 @@
+from typing import Dict, Optional
+from connection_history import ConnectionHistory
+from node import Node
+from globals import next_connection_no
+
+class InnovationRegistry:
+    """Innovation numbers handed out for structural mutations.
+
+    A mutation is the same innovation when it connects the same two nodes in
+    a genome with the same set of genes, which is what
+    ConnectionHistory.matches checks. Here that is the dict key, so a lookup
+    does not depend on how long the history is.
+
+    Entries nobody has asked for in keep_generations generations are
+    dropped by next_generation(), so the history stays small on long runs.
+    This is lossy: a mutation that comes back after its entry was dropped
+    gets a new innovation number, so crossover and compatibility distance
+    treat it as a different gene. Mutations repeated within the window keep
+    their number. Pass keep_generations=None to keep every entry and follow
+    NEAT exactly.
+
+    Like the old global counter, next_innovation is shared by every
+    registry in the process, so numbers only ever go up and are never
+    handed out twice, not even by a new population.
+    """
+    next_innovation = next_connection_no
+
+    def __init__(self, keep_generations: Optional[int] = 5):
+        self.history: Dict[tuple, ConnectionHistory] = {}
+        self.generation = 0
+        self.keep_generations = keep_generations
+
+    def get_innovation_number(self, genome: 'Genome', from_node: Node, to_node: Node) -> int:
+        innovation_numbers = [gene.innovation_no for gene in genome.genes]
+        key = (from_node.number, to_node.number, frozenset(innovation_numbers))
+
+        hist = self.history.get(key)
+        if hist is None:
+            # Create new innovation
+            hist = ConnectionHistory(from_node.number, to_node.number,
+                                     InnovationRegistry.next_innovation, innovation_numbers)
+            InnovationRegistry.next_innovation += 1
+            self.history[key] = hist
+        hist.last_generation = self.generation
+        return hist.innovation_number
+
+    def next_generation(self):
+        """Start a new generation and drop entries that have gone unused"""
+        self.generation += 1
+        if self.keep_generations is None:
+            return
+        oldest = self.generation - self.keep_generations
+        self.history = {key: hist for key, hist in self.history.items()
+                        if hist.last_generation >= oldest}
+
+    def __len__(self) -> int:
+        return len(self.history)
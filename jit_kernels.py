@@ -0,0 +1,139 @@
+"""Numeric kernels of the numba engine.
+
+The kernels are plain Python over NumPy arrays and are compiled with
+numba.njit when numba is installed. They do the same arithmetic in the same
+order as CompiledNetwork.feed_forward, Player.act and Player.move, so scores
+match the python engine exactly. Without numba they still run, only far
+slower than the python engine, which is why Population falls back to it
+when AVAILABLE is False.
+"""
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    AVAILABLE = True
+except ImportError:
+    AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Leave the kernel as plain Python"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+@njit(cache=True)
+def feed_forward(inputs, outputs, values, node_start, first_active, conn_start,
+                 conn_src, conn_dst, conn_weight, input_slots, bias_slots, output_slots):
+    """Run network r on inputs[r] and write its outputs to outputs[r].
+
+    Network r owns the slots node_start[r] to node_start[r + 1] of values,
+    conn_start holds the first connection of every slot plus an end marker.
+    Slots are global, -1 marks an input, bias or output that is missing.
+    """
+    for r in range(inputs.shape[0]):
+        first = node_start[r]
+        end = node_start[r + 1]
+        for slot in range(first, end):
+            values[slot] = 0.0
+        for i in range(inputs.shape[1]):
+            slot = input_slots[r, i]
+            if slot != -1:
+                values[slot] = inputs[r, i]
+        if bias_slots[r] != -1:
+            values[bias_slots[r]] = 1.0
+
+        # Inputs and bias are not squashed
+        active = first_active[r]
+        for k in range(conn_start[first], conn_start[active]):
+            values[conn_dst[k]] += conn_weight[k] * values[conn_src[k]]
+
+        for slot in range(active, end):
+            x = max(-60.0, min(60.0, values[slot]))
+            value = 1 / (1 + math.exp(-4.9 * x))
+            values[slot] = value
+            for k in range(conn_start[slot], conn_start[slot + 1]):
+                values[conn_dst[k]] += conn_weight[k] * value
+
+        for i in range(outputs.shape[1]):
+            slot = output_slots[r, i]
+            outputs[r, i] = values[slot] if slot != -1 else 0.0
+
+
+@njit(cache=True)
+def act(decisions, rows, pos_y, vel_y, gravity, duck):
+    """Jump or duck with each row as Player.act does"""
+    for j in range(rows.shape[0]):
+        i = rows[j]
+        choice = 0
+        for k in range(1, decisions.shape[1]):
+            if decisions[j, k] > decisions[j, choice]:
+                choice = k
+        if decisions[j, choice] > 0.5:
+            if choice == 0:
+                if pos_y[i] == 0:
+                    gravity[i] = 1.2
+                    vel_y[i] = 16.0
+            elif choice == 1:
+                if pos_y[i] == 0:
+                    gravity[i] = 1.0
+                    vel_y[i] = 20.0
+            else:
+                if pos_y[i] != 0:
+                    gravity[i] = 3.0
+                duck[i] = True
+        else:
+            duck[i] = False
+
+
+@njit(cache=True)
+def overlaps_x(pos_x, w, player_x, player_width):
+    player_left = player_x - player_width/2
+    player_right = player_x + player_width/2
+    this_left = pos_x - w/2
+    this_right = pos_x + w/2
+    return ((player_left <= this_right and player_right >= this_left) or
+            (this_left <= player_right and this_right >= player_left))
+
+
+@njit(cache=True)
+def update(rows, pos_y, vel_y, gravity, duck, score, lifespan, obstacles, birds,
+           player_x, run_width, run_height, duck_width, duck_height):
+    """Age, move and collide each row as Player.update does. obstacles holds
+    (x, w, h) and birds (x, y, w, h) per row. Returns which rows died."""
+    died = np.zeros(rows.shape[0], dtype=np.bool_)
+    for j in range(rows.shape[0]):
+        i = rows[j]
+        lifespan[i] += 1
+        if lifespan[i] % 3 == 0:
+            score[i] += 1
+
+        pos_y[i] += vel_y[i]
+        if pos_y[i] > 0:
+            vel_y[i] -= gravity[i]
+        else:
+            vel_y[i] = 0.0
+            pos_y[i] = 0.0
+
+        run_y = pos_y[i] + run_height/2
+        for k in range(obstacles.shape[0]):
+            if (overlaps_x(obstacles[k, 0], obstacles[k, 1], player_x, run_width)
+                    and run_y - run_height/2 <= obstacles[k, 2]):
+                died[j] = True
+
+        ducked = duck[i] and pos_y[i] == 0
+        duck_y = pos_y[i] + duck_height/2
+        for k in range(birds.shape[0]):
+            this_up = birds[k, 1] + birds[k, 3]/2
+            this_down = birds[k, 1] - birds[k, 3]/2
+            if ducked:
+                if (overlaps_x(birds[k, 0], birds[k, 2], player_x, duck_width)
+                        and duck_y - duck_height/2 <= this_up
+                        and duck_y + duck_height/2 >= this_down):
+                    died[j] = True
+            elif (overlaps_x(birds[k, 0], birds[k, 2], player_x, run_width)
+                    and run_y - run_height/2 <= this_up
+                    and run_y + run_height/2 >= this_down):
+                died[j] = True
+    return died
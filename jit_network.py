@@ -0,0 +1,63 @@
+from typing import List
+import numpy as np
+import jit_kernels
+
+class JitNetwork:
+    """Feed forward for a whole population of genomes in one kernel call.
+
+    Every genome's CompiledNetwork is laid out in flat arrays, one block of
+    slots and connections per genome. jit_kernels.feed_forward then runs
+    each network in exactly the order CompiledNetwork.feed_forward does,
+    which BatchNetwork can only mimic with rounds of vectorized adds.
+    """
+    def __init__(self, genomes: List['Genome']):
+        compiled = [g.compiled if g.compiled is not None else g.compile() for g in genomes]
+        self.rows = len(compiled)
+        self.n_outputs = genomes[0].outputs if genomes else 0
+
+        node_start = [0]
+        first_active = []
+        conn_start = []
+        conn_src = []
+        conn_dst = []
+        conn_weight = []
+        input_slots = []
+        bias_slots = []
+        output_slots = []
+        for net in compiled:
+            offset = node_start[-1]
+            conn_offset = len(conn_src)
+
+            def to_global(slot):
+                return slot + offset if slot != -1 else -1
+
+            first_active.append(offset + net.first_active)
+            conn_start.extend(start + conn_offset for start in net.conn_start[:-1])
+            conn_src.extend(slot + offset for slot in net.conn_src)
+            conn_dst.extend(slot + offset for slot in net.conn_dst)
+            conn_weight.extend(net.conn_weight)
+            input_slots.append([to_global(slot) for slot in net.input_slots])
+            bias_slots.append(to_global(net.bias_slot))
+            output_slots.append([to_global(slot) for slot in net.output_slots])
+            node_start.append(offset + len(net.node_order))
+        conn_start.append(len(conn_src))
+
+        self.node_start = np.array(node_start, dtype=np.int64)
+        self.first_active = np.array(first_active, dtype=np.int64)
+        self.conn_start = np.array(conn_start, dtype=np.int64)
+        self.conn_src = np.array(conn_src, dtype=np.int64)
+        self.conn_dst = np.array(conn_dst, dtype=np.int64)
+        self.conn_weight = np.array(conn_weight, dtype=np.float64)
+        self.input_slots = np.array(input_slots, dtype=np.int64).reshape(self.rows, -1)
+        self.bias_slots = np.array(bias_slots, dtype=np.int64)
+        self.output_slots = np.array(output_slots, dtype=np.int64).reshape(self.rows, self.n_outputs)
+        self.values = np.zeros(node_start[-1])
+
+    def feed_forward(self, inputs: np.ndarray) -> np.ndarray:
+        """Run every genome on its row of inputs, returns one row of outputs each"""
+        outputs = np.empty((self.rows, self.n_outputs))
+        jit_kernels.feed_forward(np.ascontiguousarray(inputs, dtype=np.float64), outputs,
+                                 self.values, self.node_start, self.first_active,
+                                 self.conn_start, self.conn_src, self.conn_dst, self.conn_weight,
+                                 self.input_slots, self.bias_slots, self.output_slots)
+        return outputs
@@ -0,0 +1,28 @@
+import numpy as np
+import jit_kernels
+from population_state import PopulationState
+from constants import (PLAYER_XPOS, DINO_RUN_HEIGHT, DINO_DUCK_HEIGHT,
+                       RUN_HITBOX_WIDTH, DUCK_HITBOX_WIDTH)
+
+class JitPopulationState(PopulationState):
+    """PopulationState whose acting, movement and collision run in
+    jit_kernels, one loop over the alive rows instead of many whole-array
+    operations"""
+    def act(self, decisions: np.ndarray, rows: np.ndarray):
+        self.decision[rows] = decisions
+        jit_kernels.act(np.ascontiguousarray(decisions, dtype=np.float64), rows,
+                        self.pos_y, self.vel_y, self.gravity, self.duck)
+
+    def update(self, world):
+        rows = self.alive_rows()
+        obstacles = np.array([(o.pos_x, o.w, o.h) for o in world.obstacles],
+                             dtype=np.float64).reshape(-1, 3)
+        birds = np.array([(b.pos_x, b.pos_y, b.w, b.h) for b in world.birds],
+                         dtype=np.float64).reshape(-1, 4)
+        died = jit_kernels.update(rows, self.pos_y, self.vel_y, self.gravity, self.duck,
+                                  self.score, self.lifespan, obstacles, birds,
+                                  float(PLAYER_XPOS), float(RUN_HITBOX_WIDTH),
+                                  float(DINO_RUN_HEIGHT), float(DUCK_HITBOX_WIDTH),
+                                  float(DINO_DUCK_HEIGHT))
+        if died.any():
+            self.kill(rows[died])
@@ -1,5 +1,4 @@
 import math
-import pygame
 from typing import List
 
 class Node:
@@ -9,7 +8,6 @@ class Node:
         self.output_value = 0
         self.output_connections = []
         self.layer = 0
-        self.draw_pos = pygame.math.Vector2()
 
     def engage(self):
         if self.layer != 0:  # No sigmoid for inputs and bias
@@ -1,45 +1,54 @@
-import pygame
 from constants import GROUND_HEIGHT
 
+# Sprite key for each cactus type
+OBSTACLE_SPRITES = ["small_cactus", "big_cactus", "many_small_cactus"]
+
 class Obstacle:
-    def __init__(self, type_num, width, obstacle_images):
+    def __init__(self, type_num, width):
+        self.spawn(type_num, width)
+
+    def spawn(self, type_num, width):
+        """(Re)start as a new obstacle at the right edge, lets the world
+        reuse instances"""
         self.pos_x = width
         self.type = type_num
         
         if type_num == 0:    # small cactus
             self.w = 40
             self.h = 80
-            self.image = obstacle_images["small_cactus"]
         elif type_num == 1:  # big cactus
             self.w = 60
             self.h = 120
-            self.image = obstacle_images["big_cactus"]
         else:               # many small cacti
             self.w = 120
             self.h = 80
-            self.image = obstacle_images["many_small_cactus"]
 
-    def show(self, screen, ground_height):
+    def show(self, screen, ground_height, images):
+        image = images[OBSTACLE_SPRITES[self.type]]
+
         # Calculate ground position
         ground_y = screen.get_height() - ground_height
         
         # Calculate draw position
-        draw_y = ground_y - self.image.get_height()
+        draw_y = ground_y - image.get_height()
         
         # Draw obstacle
-        screen.blit(self.image, (self.pos_x - self.image.get_width()/2, draw_y))
+        return screen.blit(image, (self.pos_x - image.get_width()/2, draw_y))
 
     def move(self, speed):
         self.pos_x -= speed
 
-    def collided(self, player_x, player_y, player_width, player_height):
+    def overlaps_x(self, player_x, player_width):
         player_left = player_x - player_width/2
         player_right = player_x + player_width/2
         this_left = self.pos_x - self.w/2
         this_right = self.pos_x + self.w/2
 
-        if ((player_left <= this_right and player_right >= this_left) or 
-            (this_left <= player_right and this_right >= player_left)):
+        return ((player_left <= this_right and player_right >= this_left) or 
+                (this_left <= player_right and this_right >= player_left))
+
+    def collided(self, player_x, player_y, player_width, player_height):
+        if self.overlaps_x(player_x, player_width):
             
             player_down = player_y - player_height/2
             if player_down <= self.h:
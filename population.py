@@ -1,24 +1,51 @@
-from typing import List
+from typing import List, Optional
 import random
+import time
 from player import Player
 from species import Species
-from connection_history import ConnectionHistory
-from globals import next_connection_no
-from game_state import state
+from innovation_registry import InnovationRegistry
+from profiler import profiler
 
 class Population:
-    def __init__(self, size: int):
+    def __init__(self, size: int, engine: str = "python", max_ticks: Optional[int] = None,
+                 time_budget: Optional[float] = None):
+        """engine is "python" to run every player on its own, "numpy" to
+        run the whole population through one BatchNetwork and one
+        PopulationState per tick, or "numba" to do the same with the
+        compiled kernels of jit_kernels. Without numba installed "numba"
+        falls back to "python".
+
+        max_ticks and time_budget (seconds) bound the length of a
+        generation, once either is reached the survivors are stopped.
+        """
         self.pop: List[Player] = []
         self.best_player = None
         self.best_score = 0
         self.gen = 0
-        self.innovation_history: List[ConnectionHistory] = []
+        self.innovation_history = InnovationRegistry()
         self.gen_players: List[Player] = []
         self.species: List[Species] = []
+        self.species_count = 0  # species the last selected generation was split into
         
         self.mass_extinction_event = False
         self.new_stage = False
         self.population_life = 0
+
+        self.max_ticks = max_ticks
+        self.time_budget = time_budget
+        self.generation_start: Optional[float] = None
+        self.cutoff: Optional[str] = None  # "ticks" or "time" if the generation was cut off
+        self.alive: Optional[List[Player]] = None  # living players, built on first use
+
+        if engine == "numba":
+            import jit_kernels
+            if not jit_kernels.AVAILABLE:
+                print("numba is not installed, using the python engine")
+                engine = "python"
+        self.engine = engine
+        self.batch_network = None
+        self.batch_rows = None
+        self.state = None
         
         # Initialize population
         for _ in range(size):
@@ -27,27 +54,184 @@ class Population:
             player.brain.mutate(self.innovation_history)
             self.pop.append(player)
 
-    def update_alive(self):
+    def update_alive(self, world):
         """Update all alive players"""
-        from game_state import state
-        game = state.game
-        
         self.population_life += 1
-        for player in self.pop:
-            if not player.dead:
-                # First look at environment
-                player.look(game.obstacles, game.birds, game.speed)
-                # Then think and make decisions
-                player.think()
-                # Finally update physics and state
-                player.update()
+        if self.engine in ("numpy", "numba"):
+            self.update_alive_batched(world)
+            return
+        if profiler.enabled:
+            self.update_alive_profiled(world)
+            return
+
+        alive = self.alive_players()
+        for player in alive:
+            # First look at environment
+            player.look(world)
+            # Then think and make decisions
+            player.think()
+            # Finally update physics and state
+            player.update(world)
+        self.alive = [player for player in alive if not player.dead]
+
+    def update_alive_profiled(self, world):
+        """Same as update_alive, one phase at a time so each can be timed.
+        Players don't affect each other, so the order makes no difference."""
+        alive = self.alive_players()
+        start = profiler.start()
+        for player in alive:
+            player.look(world)
+        profiler.stop("look", start)
+
+        start = profiler.start()
+        for player in alive:
+            player.think()
+        profiler.stop("think", start)
+
+        start = profiler.start()
+        for player in alive:
+            player.update(world)
+        self.alive = [player for player in alive if not player.dead]
+        profiler.stop("move", start)
+
+    def update_alive_batched(self, world):
+        """Update all alive players as arrays, the Player objects are only
+        written to when they die"""
+        if self.engine == "numba":
+            from jit_network import JitNetwork as Network
+            from jit_population_state import JitPopulationState as State
+        else:
+            from batch_network import BatchNetwork as Network
+            from population_state import PopulationState as State
+
+        if self.state is None:
+            self.state = State(self.pop)
+        state = self.state
+
+        # Rebuild the batch once half of its rows belong to dead players
+        alive = state.alive_rows()
+        if self.batch_network is None or len(alive) * 2 < len(self.batch_rows):
+            self.batch_rows = alive
+            self.batch_network = Network([self.pop[i].brain for i in alive])
+
+        start = profiler.start()
+        vision = state.look(world, self.batch_rows)
+        profiler.stop("look", start)
+
+        start = profiler.start()
+        decisions = self.batch_network.feed_forward(vision)
+        profiler.stop("think", start)
+
+        start = profiler.start()
+        live = ~state.dead[self.batch_rows]
+        state.act(decisions[live], self.batch_rows[live])
+        state.update(world)
+        profiler.stop("move", start)
+
+    def evaluate_in_pool(self, executor, world, track_seed: int, chunks: int) -> int:
+        """Run this generation in worker processes on the track given by
+        track_seed, split into chunks of players.
+
+        Gives the same scores as world.reset(track_seed) followed by
+        run_generation. The world ends up with the track history of the
+        longest run, so natural_selection works as usual. Returns the number
+        of ticks the generation lasted.
+
+        Every chunk gets the whole time budget and may stop at its own tick.
+        The generation is then cut at the earliest of those ticks, so all
+        chunks share one cutoff, as in a single process. Where that tick
+        falls still depends on the machine, so time cutoffs are never
+        reproducible; tick cutoffs are.
+        """
+        from simulation import evaluate_genomes
+
+        chunk_size = -(-len(self.pop) // chunks)
+        parts = [self.pop[i:i + chunk_size] for i in range(0, len(self.pop), chunk_size)]
+        futures = [executor.submit(evaluate_genomes, [player.brain for player in part],
+                                   track_seed, world.width, world.height, self.engine,
+                                   self.max_ticks, self.time_budget)
+                   for part in parts]
+
+        world.reset(track_seed)
+        self.alive = []
+        results = [future.result() for future in futures]
+        time_cutoffs = [result['ticks'] for result in results if result['cutoff'] == "time"]
+        limit = min(time_cutoffs) if time_cutoffs else None
+
+        longest = None
+        for part, result in zip(parts, results):
+            for player, score, lifespan in zip(part, result['scores'], result['lifespans']):
+                if limit is not None and lifespan > limit:
+                    # Stopped later than the earliest chunk, score it as a
+                    # survivor of that tick (AI players score every 3 ticks)
+                    score, lifespan = limit // 3, limit
+                player.score = score
+                player.lifespan = lifespan
+                player.dead = True
+            if longest is None or result['ticks'] > longest['ticks']:
+                longest = result
+            self.cutoff = self.cutoff or result['cutoff']
+
+        if longest is not None:
+            world.obstacle_history.extend(longest['obstacle_history'])
+            world.random_addition_history.extend(longest['random_addition_history'])
+            self.population_life = longest['ticks']
+            if limit is not None:
+                self.cutoff = "time"
+                self.population_life = min(self.population_life, limit)
+        return self.population_life
+
+    def alive_players(self, limit: Optional[int] = None) -> List[Player]:
+        """Living players in population order, only the first limit of them
+        if given. Deaths are tracked as they happen, so this costs nothing
+        for the dead ones. The list must not be changed."""
+        if self.state is not None:
+            return [self.pop[i] for i in self.state.alive_rows()[:limit]]
+        if self.alive is None:
+            self.alive = [player for player in self.pop if not player.dead]
+        return self.alive if limit is None else self.alive[:limit]
+
+    def alive_count(self) -> int:
+        if self.state is not None:
+            return len(self.state.alive_rows())
+        return len(self.alive_players())
 
     def done(self) -> bool:
-        return all(player.dead for player in self.pop)
+        """True once every player is dead or the generation ran out of ticks
+        or time"""
+        if self.cutoff is not None or self.alive_count() == 0:
+            return True
+        if self.max_ticks is not None and self.population_life >= self.max_ticks:
+            self.stop_survivors("ticks")
+            return True
+        if self.time_budget is not None and self.population_life > 0:
+            # The clock starts after the first tick, so building the batch
+            # state and networks does not count against the budget
+            now = time.perf_counter()
+            if self.generation_start is None:
+                self.generation_start = now
+            elif now - self.generation_start >= self.time_budget:
+                self.stop_survivors("time")
+                return True
+        return False
+
+    def stop_survivors(self, cutoff: str):
+        """End the generation early. Survivors keep the score and lifespan
+        they reached, as if they had died this tick."""
+        self.cutoff = cutoff
+        if self.state is not None:
+            self.state.kill(self.state.alive_rows())
+        for player in self.alive_players():
+            player.dead = True
+        self.alive = []
 
-    def natural_selection(self):
-        """Perform natural selection on the population"""
+    def natural_selection(self, world):
+        """Perform natural selection on the population that just ran in world"""
+        selection_start = profiler.start()
+        start = profiler.start()
         self.speciate()
+        profiler.stop("speciate", start)
+        self.species_count = len(self.species)
         self.calculate_fitness()
         
         if not self.species:
@@ -62,7 +246,7 @@ class Population:
             self.mass_extinction_event = False
             
         self.cull_species()
-        self.set_best_player()
+        self.set_best_player(world)
         self.kill_stale_species()
         self.kill_bad_species()
         
@@ -85,8 +269,13 @@ class Population:
             try:
                 children.append(species.champ.clone())
                 
-                # Calculate number of children this species gets
-                no_of_children = max(0, int(species.average_fitness/average_sum * len(self.pop)) - 1)
+                # Calculate number of children this species gets, an equal
+                # share each if nobody scored (e.g. a generation cut off early)
+                if average_sum:
+                    share = species.average_fitness/average_sum * len(self.pop)
+                else:
+                    share = len(self.pop) / len(self.species)
+                no_of_children = max(0, int(share) - 1)
                 for _ in range(no_of_children):
                     try:
                         children.append(species.give_me_baby(self.innovation_history))
@@ -106,12 +295,21 @@ class Population:
             
         self.pop = children
         self.gen += 1
+        self.innovation_history.next_generation()
+        self.batch_network = None
+        self.state = None
         
-        # Generate networks for all new children
+        # Generate networks for all new children. Cloning, crossover and
+        # structural mutations keep the connections wired, so only the
+        # node order needs rebuilding.
         for player in self.pop:
-            player.brain.generate_network()
+            player.brain.generate_network(connect=False)
             
         self.population_life = 0
+        self.generation_start = None
+        self.cutoff = None
+        self.alive = None
+        profiler.stop("natural_selection", selection_start)
 
     def speciate(self):
         """Separate population into species based on how similar they are"""
@@ -163,7 +361,9 @@ class Population:
     def kill_bad_species(self):
         """Remove species that are so bad they won't be allocated any children"""
         avg_sum = self.get_avg_fitness_sum()
-        
+        if avg_sum == 0:
+            return  # Nobody scored, so no species is worse than another
+
         for i in range(len(self.species)-1, 0, -1):  # Skip first species
             if self.species[i].average_fitness / avg_sum * len(self.pop) < 1:
                 self.species.pop(i)
@@ -184,7 +384,7 @@ class Population:
         while len(self.species) > 5:
             self.species.pop()
 
-    def set_best_player(self):
+    def set_best_player(self, world):
         """Set the best player globally and for this generation"""
         if not self.species or not self.species[0].players:
             # If no valid species/players, find best from population
@@ -195,8 +395,8 @@ class Population:
         temp_best.gen = self.gen
 
         if temp_best.score > self.best_score:
-            self.gen_players.append(temp_best.clone_for_replay())
+            self.gen_players.append(temp_best.clone_for_replay(world))
             print(f"old best: {self.best_score}")
             print(f"new best: {temp_best.score}")
             self.best_score = temp_best.score
-            self.best_player = temp_best.clone_for_replay()
+            self.best_player = temp_best.clone_for_replay(world)
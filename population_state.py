@@ -0,0 +1,120 @@
+from typing import List
+import numpy as np
+from player import Player
+from constants import (PLAYER_XPOS, DINO_RUN_HEIGHT, DINO_DUCK_HEIGHT,
+                       RUN_HITBOX_WIDTH, DUCK_HITBOX_WIDTH)
+
+class PopulationState:
+    """Physics state of a whole population, one NumPy array per field.
+
+    Row i belongs to players[i]. Jumping, ducking, gravity and collision run
+    as whole-array operations with the same arithmetic as Player.act and
+    Player.move, so results match the per-object path exactly.
+
+    The Player objects become views: a player's fields are written back
+    when it dies, and sync_players() refreshes the living ones on demand
+    (e.g. before drawing).
+    """
+    def __init__(self, players: List[Player]):
+        self.players = players
+        self.pos_y = np.array([p.pos_y for p in players], dtype=np.float64)
+        self.vel_y = np.array([p.vel_y for p in players], dtype=np.float64)
+        self.gravity = np.array([p.gravity for p in players], dtype=np.float64)
+        self.duck = np.array([p.duck for p in players], dtype=bool)
+        self.dead = np.array([p.dead for p in players], dtype=bool)
+        self.score = np.array([p.score for p in players], dtype=np.int64)
+        self.lifespan = np.array([p.lifespan for p in players], dtype=np.int64)
+        self.vision = np.zeros((len(players), 7))
+        self.decision = np.zeros((len(players), 3))
+        self.size = players[0].size if players else 20
+        self.alive = np.flatnonzero(~self.dead)  # living rows, shrinks as rows die
+
+    def alive_rows(self) -> np.ndarray:
+        return self.alive
+
+    def kill(self, rows: np.ndarray):
+        """Mark rows dead and write them back into their players"""
+        self.dead[rows] = True
+        self.alive = self.alive[~self.dead[self.alive]]
+        self.sync_players(rows)
+
+    def look(self, world, rows: np.ndarray) -> np.ndarray:
+        """Vision inputs for the given rows, as one matrix"""
+        vision = np.empty((len(rows), 7))
+        vision[:] = world.sense(self.size)
+        vision[:, 5] = self.pos_y[rows] / 200.0  # Normalize position
+        self.vision[rows] = vision
+        return vision
+
+    def act(self, decisions: np.ndarray, rows: np.ndarray):
+        """Jump or duck with the given rows, same rules as Player.act"""
+        self.decision[rows] = decisions
+        max_output = decisions.max(axis=1)
+        choice = decisions.argmax(axis=1)
+        active = max_output > 0.5
+        grounded = self.pos_y[rows] == 0
+
+        small_jump = rows[active & (choice == 0) & grounded]
+        self.gravity[small_jump] = 1.2
+        self.vel_y[small_jump] = 16
+
+        big_jump = rows[active & (choice == 1) & grounded]
+        self.gravity[big_jump] = 1
+        self.vel_y[big_jump] = 20
+
+        ducking = active & (choice == 2)
+        self.gravity[rows[ducking & ~grounded]] = 3
+        self.duck[rows[ducking]] = True
+        self.duck[rows[~active]] = False
+
+    def update(self, world):
+        """Age, move and collide every alive row, same rules as Player.update"""
+        rows = self.alive_rows()
+        lifespan = self.lifespan[rows] + 1
+        self.lifespan[rows] = lifespan
+        self.score[rows] += lifespan % 3 == 0
+
+        pos_y = self.pos_y[rows] + self.vel_y[rows]
+        airborne = pos_y > 0
+        vel_y = np.where(airborne, self.vel_y[rows] - self.gravity[rows], 0.0)
+        pos_y = np.where(airborne, pos_y, 0.0)
+        self.pos_y[rows] = pos_y
+        self.vel_y[rows] = vel_y
+
+        dead = np.zeros(len(rows), dtype=bool)
+        run_y = pos_y + DINO_RUN_HEIGHT/2
+        for obstacle in world.obstacles:
+            if obstacle.overlaps_x(PLAYER_XPOS, RUN_HITBOX_WIDTH):
+                dead |= run_y - DINO_RUN_HEIGHT/2 <= obstacle.h
+
+        if world.birds:
+            ducked = self.duck[rows] & (pos_y == 0)
+            duck_y = pos_y + DINO_DUCK_HEIGHT/2
+            for bird in world.birds:
+                this_up = bird.pos_y + bird.h/2
+                this_down = bird.pos_y - bird.h/2
+                if bird.overlaps_x(PLAYER_XPOS, DUCK_HITBOX_WIDTH):
+                    dead |= ducked & ((duck_y - DINO_DUCK_HEIGHT/2 <= this_up) &
+                                      (duck_y + DINO_DUCK_HEIGHT/2 >= this_down))
+                if bird.overlaps_x(PLAYER_XPOS, RUN_HITBOX_WIDTH):
+                    dead |= ~ducked & ((run_y - DINO_RUN_HEIGHT/2 <= this_up) &
+                                       (run_y + DINO_RUN_HEIGHT/2 >= this_down))
+
+        if dead.any():
+            self.kill(rows[dead])
+
+    def sync_players(self, rows=None):
+        """Write the array state back into the Player objects"""
+        if rows is None:
+            rows = range(len(self.players))
+        for i in rows:
+            player = self.players[i]
+            player.pos_y = float(self.pos_y[i])
+            player.vel_y = float(self.vel_y[i])
+            player.gravity = float(self.gravity[i])
+            player.duck = bool(self.duck[i])
+            player.dead = bool(self.dead[i])
+            player.score = int(self.score[i])
+            player.lifespan = int(self.lifespan[i])
+            player.vision = self.vision[i].tolist()
+            player.decision = self.decision[i].tolist()
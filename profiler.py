@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+class Profiler:
+    """Wall-clock time spent in each phase of a generation.
+
+    Code around a phase calls start() and stop(phase, start). While the
+    profiler is disabled both only check enabled and do not read the
+    clock, so leaving the hooks in costs next to nothing. Samples
+    are kept per generation, end_generation() appends their statistics
+    (count, total, mean, p50, p99) to a JSONL file and starts over.
+
+    The checkpoint writer thread records samples too, so samples are only
+    touched while holding lock. A sample counts for the generation in
+    which its phase finished.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.samples: Dict[str, List[float]] = {}  # phase -> seconds per call
+        self.lock = threading.Lock()
+
+    def start(self) -> float:
+        """Start of a phase, 0.0 while disabled"""
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, phase: str, start: float):
+        # A phase started while disabled has no start time to measure from
+        if self.enabled and start:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                samples = self.samples.get(phase)
+                if samples is None:
+                    samples = self.samples[phase] = []
+                samples.append(elapsed)
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        """Copy of the samples, safe to read while other threads record"""
+        with self.lock:
+            return {phase: list(samples) for phase, samples in self.samples.items()}
+
+    def totals(self) -> List[tuple]:
+        """(phase, total seconds, mean seconds) of this generation so far,
+        most expensive first. Cheap enough to call every frame."""
+        totals = []
+        for phase, samples in self.snapshot().items():
+            if samples:
+                total = sum(samples)
+                totals.append((phase, total, total / len(samples)))
+        totals.sort(key=lambda item: item[1], reverse=True)
+        return totals
+
+    def stats(self, samples_by_phase: Optional[Dict[str, List[float]]] = None
+              ) -> Dict[str, Dict[str, float]]:
+        """Statistics of every phase in this generation (or of the given
+        samples), times in ms"""
+        if samples_by_phase is None:
+            samples_by_phase = self.snapshot()
+        stats = {}
+        for phase, samples in samples_by_phase.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            count = len(ordered)
+            stats[phase] = {
+                'count': count,
+                'total_ms': sum(ordered) * 1000,
+                'mean_ms': sum(ordered) / count * 1000,
+                'p50_ms': ordered[(count - 1) // 2] * 1000,
+                'p99_ms': ordered[min(count - 1, int(count * 0.99))] * 1000,
+            }
+        return stats
+
+    def end_generation(self, gen: int, path: Optional[str] = None):
+        """Write this generation's statistics to path, if given, and start
+        the next generation"""
+        with self.lock:
+            samples, self.samples = self.samples, {}
+        if self.enabled and path is not None and samples:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(json.dumps({'gen': gen, 'phases': self.stats(samples)}) + '\n')
+
+    @staticmethod
+    def output_path(training_data_path: str) -> str:
+        """JSONL file that goes next to a training data file"""
+        return os.path.splitext(training_data_path)[0] + '.profile.jsonl'
+
+# Global profiler instance
+profiler = Profiler()
@@ -0,0 +1,236 @@
+import random
+from collections import deque
+from typing import Deque, List, Optional
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_XPOS, START_SPEED, SPEED_INCREMENT
+from obstacle import Obstacle
+from bird import Bird
+from ground import Ground
+from track import Track
+from player import Player
+from population import Population
+from profiler import profiler
+
+class World:
+    """Obstacles, birds, ground pieces and the speed ramp of one run.
+
+    The world knows nothing about pygame, so it can be stepped on machines
+    without a display. DinoGame only draws what is in here.
+
+    Obstacles come from a Track, so the same seed gives the same run in any
+    process. Without a seed every reset draws a new track seed from the
+    global random module.
+
+    Obstacles, birds and ground pieces are kept in spawn order, which is
+    also their order on screen: everything moves at the same speed and
+    spawns are further apart than the widest obstacle. Off-screen entities
+    are popped from the front and kept in a pool for the next spawn.
+    """
+    def __init__(self, width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT,
+                 seed: Optional[int] = None):
+        self.width = width
+        self.height = height
+        self.obstacles: Deque[Obstacle] = deque()
+        self.birds: Deque[Bird] = deque()
+        self.grounds: Deque[Ground] = deque()
+        self.obstacle_pool: List[Obstacle] = []
+        self.bird_pool: List[Bird] = []
+        self.ground_pool: List[Ground] = []
+        self.obstacle_history: List[int] = []
+        self.random_addition_history: List[int] = []
+        self.minimum_time_between_obstacles = 60
+        self.sensors: List[float] = []
+        self.sensor_key = None  # (size, speed) the sensors were computed for
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None):
+        """Clear all obstacles, restart the speed ramp and start the track
+        given by seed (a random one if None)"""
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.track = Track(seed)
+        self.spawn_index = 0
+        self.ground_index = 0
+        self.random_addition_history.clear()
+        self.obstacle_history.clear()
+        for entities, pool in self.queues():
+            pool.extend(entities)
+            entities.clear()
+        self.obstacle_timer = 0
+        self.random_addition = 0
+        self.ground_counter = 0
+        self.speed = START_SPEED
+        self.sensor_key = None
+
+    def update(self, lifespan: int):
+        """Advance the world by one tick.
+
+        lifespan is the number of ticks the population has lived so far,
+        birds only start showing up after 1000 of them.
+        """
+        self.obstacle_timer += 1
+        self.speed += SPEED_INCREMENT
+
+        # Add new obstacle if timer is up
+        if self.obstacle_timer > self.minimum_time_between_obstacles + self.random_addition:
+            self.add_obstacle(lifespan)
+
+        # Add ground pieces
+        self.ground_counter += 1
+        if self.ground_counter > 10:
+            self.ground_counter = 0
+            i = self.ground_index
+            self.ground_index += 1
+            self.track.ensure_grounds(i + 1)
+            self.grounds.append(self.spawn(self.ground_pool, Ground, self.width, self.height,
+                                           self.track.ground_offsets[i], self.track.ground_widths[i]))
+
+        self.move()
+        self.sensor_key = None
+
+    def sense(self, size: float) -> List[float]:
+        """Vision inputs that only depend on the world, the player's Y
+        position (input 5) is left at 0. Computed once per tick and shared
+        by every player of that size, the list must not be changed."""
+        key = (size, self.speed)
+        if key != self.sensor_key:
+            self.sensors = self.compute_sensors(size)
+            self.sensor_key = key
+        return self.sensors
+
+    def compute_sensors(self, size: float) -> List[float]:
+        vision = [0.0] * 7
+        left = PLAYER_XPOS - size/2
+
+        # The queues are in screen order, so the two nearest entities ahead
+        # are among the first two ahead in each queue. Obstacles come first
+        # so they win a tie with a bird.
+        candidates = self.ahead(self.obstacles, left) + self.ahead(self.birds, left)
+
+        # Find closest obstacle
+        min_dist = 10000
+        nearest = None
+        for dist, entity in candidates:
+            if dist < min_dist:
+                min_dist = dist
+                nearest = entity
+
+        # Set vision inputs with normalized values
+        vision[4] = self.speed / 100.0  # Normalize speed
+
+        if nearest is not None:
+            vision[0] = 1.0/(min_dist/10.0)  # Distance to obstacle
+            vision[1] = nearest.h / 100.0  # Normalize height
+            vision[2] = nearest.w / 100.0  # Normalize width
+            if isinstance(nearest, Bird) and nearest.type_of_bird != 0:
+                vision[3] = nearest.pos_y / 200.0
+
+            # Calculate gap to next obstacle
+            next_min_dist = 10000
+            for dist, _ in candidates:
+                if min_dist < dist < next_min_dist:
+                    next_min_dist = dist
+
+            if next_min_dist != 10000:
+                vision[6] = 1/(next_min_dist - min_dist)
+
+        return vision
+
+    @staticmethod
+    def ahead(entities, left: float) -> list:
+        """(distance, entity) of the first two entities whose right edge is
+        past left"""
+        found = []
+        for entity in entities:
+            dist = entity.pos_x + entity.w/2 - left
+            if dist > 0:
+                found.append((dist, entity))
+                if len(found) == 2:
+                    break
+        return found
+
+    def queues(self):
+        return ((self.obstacles, self.obstacle_pool), (self.birds, self.bird_pool),
+                (self.grounds, self.ground_pool))
+
+    def move(self):
+        """Move obstacles, birds, and ground pieces and recycle the ones that
+        left the screen"""
+        speed = self.speed
+        for entities, pool in self.queues():
+            for entity in entities:
+                entity.move(speed)
+            # Entities leave the screen in the order they came in
+            while entities and entities[0].pos_x < -PLAYER_XPOS:
+                pool.append(entities.popleft())
+
+    @staticmethod
+    def spawn(pool: list, cls, *args):
+        """A pooled instance restarted with args, or a new one"""
+        if pool:
+            entity = pool.pop()
+            entity.spawn(*args)
+            return entity
+        return cls(*args)
+
+    def add_obstacle(self, lifespan: int):
+        """Add the next obstacle or bird of the track"""
+        i = self.spawn_index
+        self.spawn_index += 1
+        track = self.track
+        track.ensure_spawns(i + 1)
+        temp_int = track.types[i]
+
+        # 15% chance for bird after 1000 lifespan
+        if lifespan > 1000 and track.bird_rolls[i] < 0.15:
+            self.birds.append(self.spawn(self.bird_pool, Bird, temp_int, self.width))
+        else:
+            self.obstacles.append(self.spawn(self.obstacle_pool, Obstacle, temp_int, self.width))
+            temp_int += 3
+
+        self.obstacle_history.append(temp_int)
+        self.random_addition = track.random_additions[i]
+        self.random_addition_history.append(self.random_addition)
+        self.obstacle_timer = 0
+
+
+def run_generation(population, world: World) -> int:
+    """Step the world and population until every player is dead, or the
+    population's tick or time budget runs out.
+
+    Nothing is drawn and nothing waits for a frame, so this runs as fast as
+    the CPU allows. Returns the number of ticks the generation lasted.
+    """
+    while not population.done():
+        if profiler.enabled:
+            start = profiler.start()
+            world.update(population.population_life)
+            profiler.stop("world", start)
+        else:
+            world.update(population.population_life)
+        population.update_alive(world)
+    return population.population_life
+
+
+def evaluate_genomes(genomes, track_seed: int, width: int = SCREEN_WIDTH,
+                     height: int = SCREEN_HEIGHT, engine: str = "python",
+                     max_ticks: Optional[int] = None, time_budget: Optional[float] = None) -> dict:
+    """Run one player per genome to extinction on the track given by track_seed.
+
+    This is what a worker process runs for its share of a generation. It only
+    needs the genomes and the seed, not the game. Players never interact, so
+    every score is the same as when the whole population shares one world.
+    """
+    population = Population(0, engine, max_ticks, time_budget)
+    for genome in genomes:
+        population.pop.append(Player(genome))
+
+    world = World(width, height, track_seed)
+    ticks = run_generation(population, world)
+    return {
+        'scores': [player.score for player in population.pop],
+        'lifespans': [player.lifespan for player in population.pop],
+        'ticks': ticks,
+        'cutoff': population.cutoff,
+        'obstacle_history': world.obstacle_history,
+        'random_addition_history': world.random_addition_history,
+    }
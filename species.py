@@ -2,6 +2,7 @@ from typing import List, Optional
 import random
 from player import Player
 from genome import Genome
+from innovation_registry import InnovationRegistry
 
 class Species:
     def __init__(self, player: Optional[Player] = None):
@@ -35,34 +36,27 @@ class Species:
         if len(genome1.genes) == 0 or len(genome2.genes) == 0:
             return 0
             
-        # Get innovation numbers for both genomes
-        innovation_numbers1 = {g.innovation_no for g in genome1.genes}
-        innovation_numbers2 = {g.innovation_no for g in genome2.genes}
+        # Both gene lists are sorted by innovation number, so a single merge
+        # pass finds the matching genes
+        innovations1, weights1 = genome1.gene_arrays()
+        innovations2, weights2 = genome2.gene_arrays()
         
-        # Count excess and disjoint genes
-        max_innovation1 = max(innovation_numbers1)
-        max_innovation2 = max(innovation_numbers2)
-        
-        # Count disjoint and excess genes
-        disjoint_excess = 0
-        for inno in innovation_numbers1:
-            if inno > max_innovation2 or inno not in innovation_numbers2:
-                disjoint_excess += 1
-                
-        for inno in innovation_numbers2:
-            if inno > max_innovation1 or inno not in innovation_numbers1:
-                disjoint_excess += 1
-        
-        # Calculate average weight difference for matching genes
         weight_diff = 0
         matching_genes = 0
+        i = j = 0
+        while i < len(innovations1) and j < len(innovations2):
+            if innovations1[i] == innovations2[j]:
+                matching_genes += 1
+                weight_diff += abs(weights1[i] - weights2[j])
+                i += 1
+                j += 1
+            elif innovations1[i] < innovations2[j]:
+                i += 1
+            else:
+                j += 1
         
-        for gene1 in genome1.genes:
-            for gene2 in genome2.genes:
-                if gene1.innovation_no == gene2.innovation_no:
-                    matching_genes += 1
-                    weight_diff += abs(gene1.weight - gene2.weight)
-                    break
+        # Every gene without a match is disjoint or excess
+        disjoint_excess = len(innovations1) + len(innovations2) - 2 * matching_genes
                     
         if matching_genes == 0:
             weight_diff = 100  # If no matching genes, make them very different
@@ -93,7 +87,7 @@ class Species:
         else:
             self.staleness += 1
 
-    def give_me_baby(self, innovation_history: List) -> Player:
+    def give_me_baby(self, innovation_history: InnovationRegistry) -> Player:
         """Create a new baby from this species"""
         # Ensure we have players to breed from
         if not self.players:
@@ -0,0 +1,39 @@
+import random
+import pytest
+from genome import Genome
+from innovation_registry import InnovationRegistry
+
+def evolved_genome(rng_seed, connections, hidden_nodes):
+    """A genome grown by structural mutations, with hidden layers and
+    disabled genes"""
+    random.seed(rng_seed)
+    registry = InnovationRegistry()
+    genome = Genome(7, 3)
+    for _ in range(connections):
+        genome.add_connection(registry)
+    for _ in range(hidden_nodes):
+        genome.add_node(registry)
+        genome.add_connection(registry)
+    for gene in genome.genes:
+        gene.weight = random.uniform(-2, 2)
+    genome.generate_network()
+    return genome
+
+@pytest.mark.parametrize("connections, hidden_nodes", [(0, 0), (1, 0), (5, 2), (10, 8), (20, 25)])
+def test_compiled_matches_feed_forward(connections, hidden_nodes):
+    rng = random.Random(connections * 100 + hidden_nodes)
+    for seed in range(5):
+        genome = evolved_genome(seed, connections, hidden_nodes)
+        for _ in range(20):
+            # Include inputs large enough to hit the sigmoid clamp
+            inputs = [rng.uniform(-50, 50) for _ in range(7)]
+            assert genome.compiled_feed_forward(inputs) == genome.feed_forward(inputs)
+
+def test_compiled_network_follows_mutations():
+    genome = evolved_genome(3, 5, 2)
+    inputs = [0.5] * 7
+    genome.compiled_feed_forward(inputs)
+    genome.mutate(InnovationRegistry())
+    genome.add_node(InnovationRegistry())
+    genome.generate_network()
+    assert genome.compiled_feed_forward(inputs) == genome.feed_forward(inputs)
@@ -0,0 +1,42 @@
+import random
+import pytest
+import jit_kernels
+from population import Population
+from simulation import World, run_generation
+
+SEED = 1234
+
+def engine_scores(engine, size=100, generations=3, force=False):
+    """Scores and lifespans of every generation of a seeded run. force runs
+    the engine even where Population would fall back to python."""
+    random.seed(SEED)
+    population = Population(size, "python" if force else engine)
+    population.engine = engine
+    world = World()
+    results = []
+    for _ in range(generations):
+        world.reset(random.getrandbits(32))
+        run_generation(population, world)
+        results.append(([player.score for player in population.pop],
+                         [player.lifespan for player in population.pop]))
+        population.natural_selection(world)
+    return results
+
+@pytest.fixture(scope="module")
+def python_scores():
+    return engine_scores("python")
+
+def test_numpy_matches_python(python_scores):
+    assert engine_scores("numpy") == python_scores
+
+@pytest.mark.skipif(not jit_kernels.AVAILABLE, reason="numba is not installed")
+def test_numba_matches_python(python_scores):
+    assert engine_scores("numba") == python_scores
+
+def test_numba_kernels_as_plain_python_match_python(python_scores, monkeypatch):
+    # Without numba the kernels are plain Python already, with numba run
+    # the original functions so the logic is checked either way
+    for name in ("feed_forward", "act", "overlaps_x", "update"):
+        kernel = getattr(jit_kernels, name)
+        monkeypatch.setattr(jit_kernels, name, getattr(kernel, "py_func", kernel))
+    assert engine_scores("numba", force=True) == python_scores
@@ -0,0 +1,36 @@
+from genome import Genome
+from innovation_registry import InnovationRegistry
+
+def connection(genome, from_number, to_number):
+    return genome.nodes[from_number], genome.nodes[to_number]
+
+def test_repeated_mutation_keeps_its_number_within_the_window():
+    genome = Genome(7, 3)
+    registry = InnovationRegistry(keep_generations=2)
+    first = registry.get_innovation_number(genome, *connection(genome, 0, 7))
+    for _ in range(2):
+        registry.next_generation()
+        assert registry.get_innovation_number(genome, *connection(genome, 0, 7)) == first
+
+def test_dropped_mutation_never_gets_an_old_number_back():
+    genome = Genome(7, 3)
+    registry = InnovationRegistry(keep_generations=2)
+    handed_out = {registry.get_innovation_number(genome, *connection(genome, 0, 7)),
+                  registry.get_innovation_number(genome, *connection(genome, 1, 8))}
+    for _ in range(3):
+        registry.next_generation()
+    assert len(registry) == 0
+
+    again = registry.get_innovation_number(genome, *connection(genome, 0, 7))
+    assert again not in handed_out
+    assert again > max(handed_out)
+
+def test_counter_continues_across_generations_and_registries():
+    genome = Genome(7, 3)
+    registry = InnovationRegistry()
+    numbers = [registry.get_innovation_number(genome, *connection(genome, 0, 7))]
+    registry.next_generation()
+    numbers.append(registry.get_innovation_number(genome, *connection(genome, 1, 7)))
+    # A new registry, e.g. of a new population, carries on the numbering
+    numbers.append(InnovationRegistry().get_innovation_number(genome, *connection(genome, 2, 7)))
+    assert numbers == list(range(numbers[0], numbers[0] + 3))
@@ -0,0 +1,35 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from population import Population
+from simulation import World, run_generation
+
+SEED = 99
+TRACK_SEED = 4321
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+def seeded_population(size, max_ticks=None):
+    random.seed(SEED)
+    return Population(size, max_ticks=max_ticks)
+
+def results(population, ticks):
+    return (ticks, [player.score for player in population.pop],
+            [player.lifespan for player in population.pop])
+
+@pytest.mark.parametrize("size, chunks, max_ticks", [(40, 2, None), (41, 3, None), (30, 2, 100)])
+def test_pool_matches_sequential(executor, size, chunks, max_ticks):
+    sequential = seeded_population(size, max_ticks)
+    world = World()
+    world.reset(TRACK_SEED)
+    expected = results(sequential, run_generation(sequential, world))
+
+    pooled = seeded_population(size, max_ticks)
+    pool_world = World()
+    assert results(pooled, pooled.evaluate_in_pool(executor, pool_world, TRACK_SEED, chunks)) == expected
+    assert pooled.cutoff == sequential.cutoff
+    assert pool_world.obstacle_history == world.obstacle_history
+    assert pool_world.random_addition_history == world.random_addition_history
@@ -0,0 +1,59 @@
+import pytest
+from constants import PLAYER_XPOS
+from simulation import World
+
+def scanned_sense(world, size):
+    """The sensors as Player.sense used to compute them, by checking every
+    obstacle and bird on screen"""
+    vision = [0.0] * 7
+    left = PLAYER_XPOS - size/2
+    obstacles = list(world.obstacles)
+    birds = list(world.birds)
+
+    min_dist = 10000
+    nearest = None
+    is_bird = False
+    for obstacle in obstacles:
+        dist = obstacle.pos_x + obstacle.w/2 - left
+        if 0 < dist < min_dist:
+            min_dist, nearest, is_bird = dist, obstacle, False
+    for bird in birds:
+        dist = bird.pos_x + bird.w/2 - left
+        if 0 < dist < min_dist:
+            min_dist, nearest, is_bird = dist, bird, True
+
+    vision[4] = world.speed / 100.0
+    if nearest is not None:
+        vision[0] = 1.0/(min_dist/10.0)
+        vision[1] = nearest.h / 100.0
+        vision[2] = nearest.w / 100.0
+        vision[3] = nearest.pos_y / 200.0 if is_bird and nearest.type_of_bird != 0 else 0.0
+
+        next_min_dist = 10000
+        for entity in obstacles + birds:
+            dist = entity.pos_x + entity.w/2 - left
+            if min_dist < dist < next_min_dist:
+                next_min_dist = dist
+        if next_min_dist != 10000:
+            vision[6] = 1/(next_min_dist - min_dist)
+    return vision
+
+@pytest.mark.parametrize("seed", range(4))
+def test_sense_matches_full_scan(seed):
+    world = World(seed=seed)
+    saw_bird = False
+    # Long enough for birds to join the obstacles
+    for tick in range(5000):
+        world.update(tick)
+        saw_bird = saw_bird or bool(world.birds)
+        for size in (40, 80, 110):
+            assert world.sense(size) == scanned_sense(world, size), (tick, size)
+    assert saw_bird
+
+def test_queues_stay_in_screen_order():
+    world = World(seed=7)
+    for tick in range(5000):
+        world.update(tick)
+        for entities, _ in world.queues():
+            positions = [entity.pos_x for entity in entities]
+            assert positions == sorted(positions)
@@ -0,0 +1,36 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+import pygame
+
+class TextCache:
+    """Rendered text surfaces, keyed by (font, size, text, color).
+
+    Static labels are rendered once and reused every frame, changing numbers
+    are only rendered again when their text changes. Past max_entries the
+    least recently used surface is dropped, so old scores age out while
+    labels drawn every frame stay.
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.fonts = {}  # (font name, size) -> Font
+        self.surfaces = OrderedDict()  # (font name, size, text, color) -> Surface
+
+    def font(self, size: int, name: Optional[str] = None) -> pygame.font.Font:
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text: str, size: int, color: Tuple[int, int, int],
+               name: Optional[str] = None) -> pygame.Surface:
+        key = (name, size, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font(size, name).render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
@@ -0,0 +1,41 @@
+import random
+from array import array
+
+class Track:
+    """Obstacle schedule of one run, generated from a seed.
+
+    Spawn i uses obstacle type types[i], becomes a bird when the population
+    is older than 1000 ticks and bird_rolls[i] < 0.15, and is followed by a
+    gap of random_additions[i] extra ticks. Ground pieces have their own
+    schedule. Entries are generated a chunk at a time as a run gets longer,
+    so stepping the world never calls the random generator, and every
+    process that builds a Track from the same seed gets the same schedule.
+    """
+    CHUNK = 256
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.obstacle_rng = random.Random(seed)
+        self.ground_rng = random.Random(f"{seed}:ground")
+        self.types = array('b')
+        self.bird_rolls = array('d')
+        self.random_additions = array('b')
+        self.ground_offsets = array('b')
+        self.ground_widths = array('b')
+
+    def ensure_spawns(self, count: int):
+        """Make sure the first count spawns are generated"""
+        rng = self.obstacle_rng
+        while len(self.types) < count:
+            for _ in range(self.CHUNK):
+                self.bird_rolls.append(rng.random())
+                self.types.append(rng.randint(0, 2))
+                self.random_additions.append(rng.randint(0, 50))
+
+    def ensure_grounds(self, count: int):
+        """Make sure the first count ground pieces are generated"""
+        rng = self.ground_rng
+        while len(self.ground_offsets) < count:
+            for _ in range(self.CHUNK):
+                self.ground_offsets.append(rng.randint(-20, 30))
+                self.ground_widths.append(rng.randint(1, 10))
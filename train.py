@@ -0,0 +1,172 @@
+"""Headless trainer, for running long jobs without a display.
+
+    python -m train --population 500 --generations 60 --seed 1
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from constants import GENERATIONS
+from population import Population
+from simulation import World, run_generation
+from training_data import TrainingData
+from checkpoint_writer import CheckpointWriter
+from profiler import profiler, Profiler
+
+def train(population_size: int, generations: int, seed: Optional[int] = None,
+          training_data: Optional[TrainingData] = None, engine: str = "python",
+          workers: int = 1, profile_path: Optional[str] = None, max_ticks: Optional[int] = None,
+          time_budget: Optional[float] = None) -> dict:
+    """Evolve a population for a number of generations and return run stats.
+
+    Every generation runs on a track seeded from the global random module,
+    so a seeded run gives the same result for any number of workers.
+    With a profile_path the time spent in each phase is appended there as
+    one JSON line per generation. max_ticks and time_budget (seconds) cut
+    off generations that run too long, survivors keep the score they had.
+    """
+    if seed is not None:
+        random.seed(seed)
+    if profile_path is not None:
+        profiler.enabled = True
+
+    population = Population(population_size, engine, max_ticks, time_budget)
+    world = World()
+    player_ticks = 0
+    cutoffs = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    writer = CheckpointWriter(training_data) if training_data is not None else None
+    start = time.perf_counter()
+
+    try:
+        for _ in range(generations):
+            ticks, cutoff = run_one_generation(population, world, writer, executor, workers)
+            player_ticks += ticks
+            cutoffs += cutoff is not None
+            profiler.end_generation(population.gen - 1, profile_path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'generations': generations,
+        'cutoff_generations': cutoffs,
+        'seconds': elapsed,
+        'player_ticks': player_ticks,
+        'generations_per_sec': generations / elapsed if elapsed else 0.0,
+        'player_ticks_per_sec': player_ticks / elapsed if elapsed else 0.0,
+    }
+
+def run_one_generation(population: Population, world: World, writer: Optional[CheckpointWriter],
+                       executor: Optional[ProcessPoolExecutor], workers: int
+                       ) -> Tuple[int, Optional[str]]:
+    """Evaluate the current generation, select the next one and record the
+    evaluated one. Returns its player-ticks and cutoff."""
+    track_seed = random.getrandbits(32)
+    if executor is not None:
+        start = profiler.start()
+        ticks = population.evaluate_in_pool(executor, world, track_seed, workers)
+        profiler.stop("evaluate", start)
+    else:
+        world.reset(track_seed)
+        ticks = run_generation(population, world)
+
+    gen = population.gen
+    cutoff = population.cutoff
+    best_player = max(population.pop, key=lambda p: p.score)
+    avg_score = sum(p.score for p in population.pop) / len(population.pop)
+    player_ticks = sum(player.lifespan for player in population.pop)
+
+    # Selection speciates the generation, later it drops stale and bad species
+    population.natural_selection(world)
+    num_species = population.species_count
+
+    cutoff_note = ""
+    if cutoff is not None:
+        limit = "tick limit" if cutoff == "ticks" else "time budget"
+        cutoff_note = f" (stopped at the {limit})"
+    print(f"Gen {gen + 1}: best {best_player.score}, avg {avg_score:.1f}, "
+          f"{ticks} ticks{cutoff_note}, {num_species} species")
+
+    if writer is not None:
+        writer.training_data.add_generation_data(
+            gen,
+            best_player.score,
+            avg_score,
+            best_player.brain,
+            num_species,
+            best_player.vision_history,
+            best_player.decision_history,
+            ticks,
+            cutoff
+        )
+        start = profiler.start()
+        writer.save()
+        profiler.stop("save", start)
+    return player_ticks, cutoff
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the dino AI without a display")
+    parser.add_argument("--population", type=int, default=500,
+                        help="number of dinos per generation (default: 500)")
+    parser.add_argument("--generations", type=int, default=GENERATIONS,
+                        help=f"number of generations to run (default: {GENERATIONS})")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the random number generator")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes used to evaluate a generation (default: 1)")
+    parser.add_argument("--engine", choices=["python", "numpy", "numba"], default="python",
+                        help="run brains one by one, the whole population as one NumPy batch, or "
+                             "as compiled numba kernels if numba is installed (default: python)")
+    parser.add_argument("--max-ticks", type=int, default=None,
+                        help="stop a generation after this many ticks, survivors keep their score")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="stop a generation after this many seconds, survivors keep their score")
+    parser.add_argument("--output", default=None,
+                        help="training data file (default: training_data/trained_model.log)")
+    parser.add_argument("--no-save", action="store_true",
+                        help="do not write training data")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each phase and write the statistics next to the training data "
+                             "(per-tick phases are only timed without --workers)")
+    args = parser.parse_args(argv)
+
+    if args.population < 2:
+        # The first player is the previous champion and keeps its fitness,
+        # a population of one never gets a fitness to select by
+        parser.error("--population must be at least 2")
+    if args.generations < 0:
+        parser.error("--generations must not be negative")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_ticks is not None and args.max_ticks < 1:
+        parser.error("--max-ticks must be at least 1")
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be positive")
+
+    training_data = None
+    if not args.no_save:
+        training_data = TrainingData()
+        if args.output:
+            training_data.file_path = args.output
+
+    profile_path = None
+    if args.profile:
+        profile_path = Profiler.output_path(args.output or TrainingData().file_path)
+
+    stats = train(args.population, args.generations, args.seed, training_data, args.engine,
+                  args.workers, profile_path, args.max_ticks, args.time_budget)
+    print(f"{stats['generations']} generations in {stats['seconds']:.1f}s: "
+          f"{stats['generations_per_sec']:.3f} generations/sec, "
+          f"{stats['player_ticks_per_sec']:.0f} player-ticks/sec")
+    if stats['cutoff_generations']:
+        print(f"{stats['cutoff_generations']} generation(s) stopped at a limit")
+    if profile_path is not None:
+        print(f"Phase timings written to {profile_path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,288 @@
 import os
+import sys
+import mmap
 import pickle
-from typing import Dict, Any
+import struct
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
 from genome import Genome
 
+# Every record in the log is a header followed by one generation's data
+RECORD_MAGIC = b'DGEN'
+RECORD_VERSION = 2
+RECORD_HEADER = struct.Struct('<4sHqQ')  # magic, format version, generation, payload length
+# Fixed part of a payload. It is followed by the node arrays (numbers,
+# layers), the gene arrays (from, to, innovation, weight, enabled) and the
+# vision and decision histories as flat float64 arrays.
+GENERATION_FIELDS_V1 = struct.Struct(
+    '<qdq'       # best score, average score, number of species
+    'iiiii'      # genome inputs, outputs, layers, next node, bias node
+    'II'         # node count, gene count
+    'IIII')      # vision rows and width, decision rows and width
+GENERATION_FIELDS = struct.Struct(GENERATION_FIELDS_V1.format + 'qB')  # + ticks, cutoff
+CUTOFFS = (None, 'ticks', 'time')  # stored as the position in this tuple
+GENOME_TYPECODES = ('i', 'i', 'i', 'i', 'q', 'd', 'b')  # same order as Genome.to_arrays
+# The index file holds one entry per saved record
+INDEX_ENTRY = struct.Struct('<qQQ')     # generation, record offset, record length
+
 class TrainingData:
+    """Per-generation training results, saved as an append-only log.
+
+    Each save appends only the generations added since the last one, then
+    appends their entries to the index file (file_path + '.idx'), so a save
+    costs the same however long the run is. A record only counts once it
+    is in the index, so a crash loses at most the records being written;
+    a torn index entry is dropped on reading. Older single-pickle files
+    are still read.
+
+    Records store the best genome as flat little-endian arrays, so reading
+    them needs neither pygame nor the classes that were pickled. Loading
+    one generation memory-maps the log and decodes only that record.
+    """
     def __init__(self):
         self.data = {}  # generation -> generation data
-        self.file_path = os.path.join(os.path.dirname(__file__), 'training_data', 'trained_model.pkl')
-        
-    def add_generation_data(self, gen: int, best_score: float, avg_score: float, 
-                          best_genome: Genome, num_species: int, vision_history=None, decision_history=None):
-        """Store training data including vision inputs and decisions made"""
+        directory = os.path.join(os.path.dirname(__file__), 'training_data')
+        self.file_path = os.path.join(directory, 'trained_model.log')
+        self.legacy_file_path = os.path.join(directory, 'trained_model.pkl')
+        self.index: Dict[int, Tuple[int, int]] = {}  # generation -> (offset, length) in the log
+        self.unsaved = []  # generations added since the last save
+        self.log_started = False  # False until this run has written or loaded the log
+
+    @property
+    def index_path(self) -> str:
+        return self.file_path + '.idx'
+
+    def add_generation_data(self, gen: int, best_score: float, avg_score: float,
+                          best_genome: Genome, num_species: int, vision_history=None, decision_history=None,
+                          ticks: Optional[int] = None, cutoff: Optional[str] = None):
+        """Store training data including vision inputs and decisions made.
+        cutoff is "ticks" or "time" if the generation was stopped early."""
         self.data[gen] = {
             'best_score': best_score,
             'avg_score': avg_score,
             'best_genome': best_genome,
             'num_species': num_species,
             'vision_history': vision_history or [],  # Store what AI saw
-            'decision_history': decision_history or []  # Store what AI decided to do
+            'decision_history': decision_history or [],  # Store what AI decided to do
+            'ticks': ticks,
+            'cutoff': cutoff
         }
-    
+        self.unsaved.append(gen)
+
     def save_to_file(self):
+        """Append the generations added since the last save"""
+        self.write_records(self.take_unsaved())
+
+    def take_unsaved(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Snapshot the generations added since the last save, for
+        write_records. Genomes are cloned so training can go on while the
+        snapshot is written."""
+        records = []
+        for gen in self.unsaved:
+            data = dict(self.data[gen])
+            data['best_genome'] = data['best_genome'].clone()
+            records.append((gen, data))
+        self.unsaved.clear()
+        return records
+
+    def write_records(self, records: List[Tuple[int, Dict[str, Any]]]):
+        """Append records to the log and then publish them in the index"""
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        with open(self.file_path, 'wb') as f:
-            pickle.dump(self.data, f)
-            
+
+        # The first save of a new run starts a new log. The index is emptied
+        # first so it never points into the new log.
+        if not self.log_started:
+            self.index.clear()
+            self.replace_index()
+            open(self.file_path, 'wb').close()
+            self.log_started = True
+
+        entries = []
+        with open(self.file_path, 'ab') as log:
+            for gen, data in records:
+                record = self.encode_record(gen, data)
+                offset = log.tell()
+                log.write(record)
+                entries.append((gen, offset, len(record)))
+            log.flush()
+            os.fsync(log.fileno())
+
+        # Records only count once they are indexed
+        for gen, offset, length in entries:
+            self.index[gen] = (offset, length)
+        if os.path.exists(self.index_path):
+            self.append_index(entries)
+        else:
+            self.replace_index()  # The index was rebuilt from the log when loading
+
+    def append_index(self, entries: List[Tuple[int, int, int]]):
+        """Append (gen, offset, length) entries to the index file"""
+        with open(self.index_path, 'r+b') as index:
+            # Cut off an entry torn by a crash, so new entries stay aligned
+            size = index.seek(0, os.SEEK_END)
+            index.truncate(size - size % INDEX_ENTRY.size)
+            index.seek(0, os.SEEK_END)
+            for gen, offset, length in entries:
+                index.write(INDEX_ENTRY.pack(gen, offset, length))
+            index.flush()
+            os.fsync(index.fileno())
+
+    def replace_index(self):
+        """Write the whole index to a temporary file and rename it over the
+        old one, so readers see either the old or the new index. Only used
+        when a run starts a new log or the index file is missing."""
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'wb') as index:
+            for gen, (offset, length) in self.index.items():
+                index.write(INDEX_ENTRY.pack(gen, offset, length))
+            index.flush()
+            os.fsync(index.fileno())
+        os.replace(temp_path, self.index_path)
+
     def load_from_file(self):
-        if os.path.exists(self.file_path):
-            with open(self.file_path, 'rb') as f:
+        """Load every saved generation"""
+        if self.load_index():
+            self.data = {}
+            for gen in self.generations():
+                self.load_generation(gen)
+        elif os.path.exists(self.legacy_file_path):
+            with open(self.legacy_file_path, 'rb') as f:
                 self.data = pickle.load(f)
         else:
             raise FileNotFoundError("No training data found")
+
+    def load_index(self) -> bool:
+        """Read the index of the log without decoding any record. Returns
+        False if the log is missing or holds no records."""
+        index = self.read_index() if os.path.exists(self.file_path) else {}
+        if not index:
+            return False
+        self.index = index
+        self.log_started = True
+        self.unsaved.clear()
+        return True
+
+    def generations(self) -> List[int]:
+        """Saved generation numbers, oldest first"""
+        return sorted(self.index)
+
+    def load_generation(self, gen: Optional[int] = None) -> Tuple[int, Dict[str, Any]]:
+        """Decode one generation (the last one if gen is None) and return
+        (gen, data). Only that record is read from the log."""
+        if not self.index and not self.load_index():
+            # Old files are one pickle, they can only be read whole
+            if not self.data:
+                self.load_from_file()
+            if gen is None:
+                gen = max(self.data)
+            return gen, self.data[gen]
+
+        if gen is None:
+            gen = max(self.index)
+        if gen not in self.data:
+            offset, length = self.index[gen]
+            with open(self.file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log:
+                self.data[gen] = self.decode_record(gen, log[offset:offset + length])
+        return gen, self.data[gen]
+
+    def read_index(self) -> Dict[int, Tuple[int, int]]:
+        """Read the index, dropping entries torn by a crash. Rebuilds it from
+        the log if the index file is missing."""
+        if not os.path.exists(self.index_path):
+            return self.scan_log()
+
+        log_size = os.path.getsize(self.file_path)
+        with open(self.index_path, 'rb') as f:
+            raw = f.read()
+
+        index = {}
+        usable = len(raw) - len(raw) % INDEX_ENTRY.size
+        for gen, offset, length in INDEX_ENTRY.iter_unpack(raw[:usable]):
+            if offset + length <= log_size:
+                index[gen] = (offset, length)  # A later record for a generation wins
+        return index
+
+    def scan_log(self) -> Dict[int, Tuple[int, int]]:
+        """Find the records by walking the log, stops at the first torn one"""
+        index = {}
+        log_size = os.path.getsize(self.file_path)
+        with open(self.file_path, 'rb') as log:
+            offset = 0
+            while offset + RECORD_HEADER.size <= log_size:
+                magic, _, gen, payload_length = RECORD_HEADER.unpack(log.read(RECORD_HEADER.size))
+                length = RECORD_HEADER.size + payload_length
+                if magic != RECORD_MAGIC or offset + length > log_size:
+                    break
+                index[gen] = (offset, length)
+                offset += length
+                log.seek(offset)
+        return index
+
+    @staticmethod
+    def encode_record(gen: int, data: Dict[str, Any]) -> bytes:
+        genome = data['best_genome']
+        vision = data['vision_history']
+        decisions = data['decision_history']
+        vision_width = len(vision[0]) if vision else 0
+        decision_width = len(decisions[0]) if decisions else 0
+
+        payload = bytearray(GENERATION_FIELDS.pack(
+            data['best_score'], data['avg_score'], data['num_species'],
+            genome.inputs, genome.outputs, genome.layers, genome.next_node, genome.bias_node,
+            len(genome.nodes), len(genome.genes),
+            len(vision), vision_width, len(decisions), decision_width,
+            data.get('ticks') or 0, CUTOFFS.index(data.get('cutoff'))))
+        arrays = genome.to_arrays() + (array('d', [x for row in vision for x in row]),
+                                       array('d', [x for row in decisions for x in row]))
+        for values in arrays:
+            if sys.byteorder == 'big':
+                values.byteswap()
+            payload += values.tobytes()
+        return RECORD_HEADER.pack(RECORD_MAGIC, RECORD_VERSION, gen, len(payload)) + payload
+
+    @staticmethod
+    def decode_record(gen: int, record: bytes) -> Dict[str, Any]:
+        magic, version, record_gen, payload_length = RECORD_HEADER.unpack_from(record)
+        if magic != RECORD_MAGIC or record_gen != gen:
+            raise ValueError(f"Corrupt training data record for generation {gen}")
+        if version not in (1, RECORD_VERSION):
+            raise ValueError(f"Unsupported training data format version {version}")
+
+        # Version 1 records have no ticks and cutoff
+        fields = GENERATION_FIELDS if version == RECORD_VERSION else GENERATION_FIELDS_V1
+        values = fields.unpack_from(record, RECORD_HEADER.size)
+        (best_score, avg_score, num_species, inputs, outputs, layers, next_node, bias_node,
+         node_count, gene_count, vision_rows, vision_width, decision_rows, decision_width
+         ) = values[:14]
+        ticks, cutoff = values[14:] if version == RECORD_VERSION else (0, 0)
+
+        offset = RECORD_HEADER.size + fields.size
+
+        def read(typecode: str, count: int) -> array:
+            nonlocal offset
+            values = array(typecode)
+            end = offset + count * values.itemsize
+            values.frombytes(record[offset:end])
+            if sys.byteorder == 'big':
+                values.byteswap()
+            offset = end
+            return values
+
+        counts = (node_count, node_count) + (gene_count,) * 5
+        genome_arrays = [read(typecode, count) for typecode, count in zip(GENOME_TYPECODES, counts)]
+        vision = read('d', vision_rows * vision_width)
+        decisions = read('d', decision_rows * decision_width)
+        return {
+            'best_score': best_score,
+            'avg_score': avg_score,
+            'best_genome': Genome.from_arrays(inputs, outputs, layers, next_node, bias_node,
+                                              *genome_arrays),
+            'num_species': num_species,
+            'vision_history': [vision[i * vision_width:(i + 1) * vision_width].tolist()
+                               for i in range(vision_rows)],
+            'decision_history': [decisions[i * decision_width:(i + 1) * decision_width].tolist()
+                                 for i in range(decision_rows)],
+            'ticks': ticks or None,
+            'cutoff': CUTOFFS[cutoff],
+        }